@@ -1,50 +1,1463 @@
 #!/usr/bin/env python3
 
-from functools import wraps
+import argparse
+import glob
+import hashlib
+import importlib
+import inspect
+import io
+import json
+import math
+import mmap
+import os
+import pickle
+import random
+import re
+import reprlib
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import traceback
+from array import array
+from collections import deque
+from collections.abc import Buffer
+from copy import deepcopy
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields, is_dataclass, replace
+from datetime import datetime, timezone
+from enum import Enum
+from functools import cache, cached_property, wraps
 from pathlib import Path
-from typing import Callable
+from types import CodeType, FunctionType, MappingProxyType, ModuleType
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Literal, TextIO
+from urllib.parse import urlsplit
 from urllib.request import Request, urlopen
 
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
 YEAR = 2023
 INPUT_URL_TEMPLATE = f"https://adventofcode.com/{YEAR}/day/{{day}}/input"
 INPUT_FILE_TEMPLATE = "inputs/day{day:02}.txt"
+STATE_DIR = Path(".aoc")
+
+
+@dataclass
+class Settings:
+    """Harness options, initialized from AOC_* environment variables."""
+    repeat: int = int(os.environ.get("AOC_REPEAT", 1))
+    report: str | None = os.environ.get("AOC_REPORT")
+    cache: bool = os.environ.get("AOC_CACHE", "1") != "0"
+    profile: bool = os.environ.get("AOC_PROFILE", "0") != "0"
+    speculative: bool = os.environ.get("AOC_SPECULATIVE", "0") != "0"
+    instrument: bool = os.environ.get("AOC_INSTRUMENT", "0") != "0"
+    checkpoints: bool = os.environ.get("AOC_CHECKPOINTS", "1") != "0"
+    timeout: float | None = float(os.environ["AOC_TIMEOUT"]) if "AOC_TIMEOUT" in os.environ else None
+    max_memory: int | None = (  # in bytes, configured in MiB
+        int(float(os.environ["AOC_MAX_MEMORY"]) * 2**20) if "AOC_MAX_MEMORY" in os.environ else None)
+    input_url: str = os.environ.get("AOC_INPUT_URL", INPUT_URL_TEMPLATE)
+
+    @property
+    def counting(self) -> bool:
+        """Whether counters are collected, for reporting progress or where a killed part stopped."""
+        return self.instrument or self.timeout is not None or self.max_memory is not None
+
+SETTINGS = Settings()
+
 
 def fetch_input(*, day: int) -> str:
     """Download input file for the website. Needs session cookie in './cookie'"""
     session_id = Path("cookie").read_text().strip()
-    req = Request(INPUT_URL_TEMPLATE.format(day=day))
+    req = Request(SETTINGS.input_url.format(day=day))
     req.add_header("Cookie", f"session={session_id}")
     return urlopen(req).read().decode()
 
 
+class FetchError(Exception):
+    def __init__(self, status: int, reason: str):
+        super().__init__(f"HTTP {status} {reason}")
+        self.status = status
+        self.retryable = status == 429 or status >= 500
+
+
+def get_missing_inputs(days: Iterable[int]) -> list[int]:
+    return [day for day in days if not Path(INPUT_FILE_TEMPLATE.format(day=day)).is_file()]
+
+
+async def prefetch_inputs(days: Iterable[int], *, concurrency: int = 5, retries: int = 3,
+                          backoff: float = .5) -> dict[int, Exception | None]:
+    """Concurrently download all missing inputs of the given days.
+    Each of the `concurrency` workers keeps one keep-alive connection open
+    and reuses it for its downloads. Failed requests (connection errors,
+    HTTP 429 and 5xx) are retried with exponential backoff.
+    Returns the error of each day that could not be downloaded, or None.
+    """
+    import asyncio
+    import http.client
+
+    missing = get_missing_inputs(days)
+    if not missing:
+        return {}
+    try:
+        session_id = Path("cookie").read_text().strip()
+    except OSError as error:
+        print(f"Can't download inputs of days {', '.join(map(str, missing))}: {error}")
+        return dict.fromkeys(missing, error)
+    queue = asyncio.Queue[int]()
+    for day in missing:
+        queue.put_nowait(day)
+    outcomes: dict[int, Exception | None] = {}
+
+    def download(connection: http.client.HTTPConnection, path: str) -> bytes:
+        connection.request("GET", path, headers={"Cookie": f"session={session_id}"})
+        response = connection.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise FetchError(response.status, response.reason)
+        return body
+
+    async def worker():
+        connection = None
+        while not queue.empty():
+            day = queue.get_nowait()
+            url = urlsplit(SETTINGS.input_url.format(day=day))
+            for attempt in range(retries + 1):
+                if connection is None:
+                    connection_type = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+                    connection = connection_type(url.netloc, timeout=30)
+                try:
+                    body = await asyncio.to_thread(download, connection, url.path)
+                except (OSError, http.client.HTTPException, FetchError) as error:
+                    if not isinstance(error, FetchError):
+                        connection.close()
+                        connection = None
+                    if attempt == retries or not getattr(error, "retryable", True):
+                        outcomes[day] = error
+                        print(f"Downloading day {day} failed: {error}")
+                        break
+                    await asyncio.sleep(backoff * 2 ** attempt)
+                else:
+                    path = Path(INPUT_FILE_TEMPLATE.format(day=day))
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    partial = path.with_suffix(".part")
+                    partial.write_bytes(body)
+                    partial.replace(path)
+                    outcomes[day] = None
+                    print(f"Downloaded {path}")
+                    break
+        if connection is not None:
+            connection.close()
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(missing)))))
+    return outcomes
+
+
+def serve_inputs(directory: Path, *, port: int = 8023, delay: float = 0.):
+    """Serve dayNN.txt files from a directory the way the website serves
+    inputs, as a local stand-in for testing downloads. `delay` simulates
+    the latency of each request.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep connections alive
+        connections = 0
+
+        def setup(self):
+            super().setup()
+            StandInHandler.connections += 1
+            self.connection_id = StandInHandler.connections
+
+        def do_GET(self):
+            time.sleep(delay)
+            match = re.fullmatch(rf"/{YEAR}/day/(\d+)/input", self.path)
+            path = directory / f"day{int(match[1]):02}.txt" if match else None
+            if "session=" not in self.headers.get("Cookie", ""):
+                self.send_error(400, "Missing session cookie")
+            elif path is None or not path.is_file():
+                self.send_error(404)
+            else:
+                body = path.read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            print(f"[connection {self.connection_id}] {format % args}")
+
+    with ThreadingHTTPServer(("127.0.0.1", port), StandInHandler) as server:
+        print(f"Serving {directory} on http://127.0.0.1:{port}/{YEAR}/day/{{day}}/input")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+class InputFile:
+    """Read-only memory map of an input file with lazily cached views."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        stat = path.stat()
+        self.version = stat.st_mtime_ns, stat.st_size
+        with path.open("rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+
+    @cached_property
+    def view(self) -> memoryview:
+        return memoryview(self.data)
+
+    @cached_property
+    def text(self) -> str:
+        return bytes(self.data).decode()
+
+    @cached_property
+    def stripped(self) -> str:
+        """The text as solvers receive it."""
+        return self.text.strip()
+
+    @cached_property
+    def line_offsets(self) -> array:
+        """Start offset of each line, plus the end of the data."""
+        offsets = array("q", [0])
+        data, find = self.data, self.data.find
+        while (newline := find(b"\n", offsets[-1])) != -1:
+            offsets.append(newline + 1)
+        if offsets[-1] != len(data):
+            offsets.append(len(data) + 1)
+        return offsets
+
+    def line(self, idx: int) -> memoryview:
+        return self.view[self.line_offsets[idx]:self.line_offsets[idx + 1] - 1]
+
+    def __len__(self) -> int:
+        """Number of lines"""
+        return len(self.line_offsets) - 1
+
+    @cached_property
+    def grid_rows(self) -> tuple[memoryview, ...]:
+        """Rows of a rectangular grid, without copying. Trailing empty lines are ignored."""
+        rows = [self.line(idx) for idx in range(len(self))]
+        while rows and not len(rows[-1]):
+            rows.pop()
+        if len({len(row) for row in rows}) > 1:
+            raise ValueError(f"{self.path} is not a fixed-width grid")
+        return tuple(rows)
+
+
+class InputStore:
+    """Maps each input file once per process and shares it between all parts."""
+
+    def __init__(self):
+        self.files: dict[Path, InputFile] = {}
+
+    def path(self, *, day: int) -> Path:
+        """Path of the day's input file, downloading it if needed."""
+        path = Path(INPUT_FILE_TEMPLATE.format(day=day))
+        if not path.is_file():
+            print(f"Downloading {path}...")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(fetch_input(day=day))
+        return path
+
+    def get(self, *, day: int) -> InputFile:
+        path = self.path(day=day)
+        input_file = self.files.get(path)
+        stat = path.stat()
+        if input_file is None or input_file.version != (stat.st_mtime_ns, stat.st_size):
+            input_file = self.files[path] = InputFile(path)
+        return input_file
+
+INPUTS = InputStore()
+
+
+def read_lines(source: str | Path) -> Iterator[str]:
+    """Lazily read lines of an input text or file without line breaks.
+    Leading and trailing blank lines are skipped, like `str.strip` would.
+    """
+    with source.open() if isinstance(source, Path) else io.StringIO(source) as file:
+        blank_lines = []
+        started = False
+        for line in file:
+            line = line.rstrip("\n")
+            if not line.strip():
+                if started:
+                    blank_lines.append(line)
+                continue
+            started = True
+            yield from blank_lines
+            blank_lines.clear()
+            yield line
+
+
+def read_records(source: str | Path) -> Iterator[str]:
+    """Lazily read blocks of lines separated by blank lines."""
+    record = []
+    for line in read_lines(source):
+        if line:
+            record.append(line)
+        else:
+            if record:
+                yield "\n".join(record)
+            record = []
+    if record:
+        yield "\n".join(record)
+
+
+STREAM_READERS = {"lines": read_lines, "records": read_records}
+
+
 def get_input(*, day: int) -> str:
     """Get input for given day from existing file or download if needed."""
-    path = Path(INPUT_FILE_TEMPLATE.format(day=day))
-    if not path.is_file():
-        print(f"Downloading {path}...")
-        path.write_text(fetch_input(day=day))
-    return path.read_text()
+    return INPUTS.get(day=day).text
+
+
+@dataclass
+class Measurement:
+    """Result and timings of one solver run on one input."""
+    day: int
+    part: int
+    input: str
+    result: object
+    expected: object = None
+    load_time: float = 0.0
+    run_times: list[float] = field(default_factory=list)
+    cached: bool = False
+    peak_memory: int | None = None
+    allocations: list[str] = field(default_factory=list)
+    profile: str | None = None
+    caches: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool | None:
+        return None if self.expected is None else self.result == self.expected
+
+    @property
+    def min(self) -> float:
+        return min(self.run_times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.run_times)
+
+    @property
+    def max(self) -> float:
+        return max(self.run_times)
+
+    def to_json(self) -> dict:
+        return {
+            "day": self.day,
+            "part": self.part,
+            "input": self.input,
+            "result": self.result,
+            "expected": self.expected,
+            "ok": self.ok,
+            "load_s": self.load_time,
+            "runs_s": self.run_times,
+            "min_s": self.min,
+            "median_s": self.median,
+            "max_s": self.max,
+            "cached": self.cached,
+            "peak_bytes": self.peak_memory,
+            "profile": self.profile,
+            "caches": self.caches,
+        }
+
+
+def measure[T](fn: Callable[[str], T], load: Callable[[], str], *, repeat: int = 1, **info) -> Measurement:
+    """Time loading the input once and running the solver `repeat` times on it.
+    Every run parses the input again, so that all of them measure the same work.
+    """
+    start = time.perf_counter()
+    input = load()
+    load_time = time.perf_counter() - start
+
+    if SETTINGS.profile:
+        PARSE_CACHE.clear()
+        name = f"day{info['day']:02}-part{info['part']}-{info['input'].replace(' ', '-')}.pstats"
+        return profile(fn, input, PROFILE_DIR / name, load_time=load_time, **info)
+
+    run_times = []
+    for _ in range(max(1, repeat)):
+        PARSE_CACHE.clear()
+        start = time.perf_counter()
+        result = fn(input)
+        run_times.append(time.perf_counter() - start)
+    return Measurement(result=result, load_time=load_time, run_times=run_times, **info)
+
+
+PROFILE_DIR = STATE_DIR / "profiles"
+TRACEMALLOC_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+)
+
+def profile[T](fn: Callable[[str], T], input: str, path: Path, /, *, top: int = 5, **info) -> Measurement:
+    """Run the solver once under cProfile and tracemalloc, writing pstats to `path`.
+    A background thread snapshots allocations whenever traced memory hits a
+    new high, so the reported top lines reflect the peak rather than the end.
+    """
+    import cProfile
+
+    ignored = (*TRACEMALLOC_IGNORED, tracemalloc.Filter(False, cProfile.__file__))
+    profiler = cProfile.Profile()
+    peak_snapshot = None
+    done = threading.Event()
+
+    def watch_peak(interval: float = .05):
+        nonlocal peak_snapshot
+        highest = 0
+        while not done.wait(interval):
+            if (current := tracemalloc.get_traced_memory()[0]) > highest:
+                highest, peak_snapshot = current, tracemalloc.take_snapshot()
+
+    tracemalloc.start()
+    watcher = threading.Thread(target=watch_peak, daemon=True)
+    watcher.start()
+    start = time.perf_counter()
+    try:
+        result = profiler.runcall(fn, input)
+    finally:
+        duration = time.perf_counter() - start
+        done.set()
+        watcher.join()
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = peak_snapshot or tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(path)
+    allocations = [f"{format_bytes(stat.size)} in {stat.traceback[0].filename}:{stat.traceback[0].lineno}"
+                   for stat in snapshot.filter_traces(ignored).statistics("lineno")[:top]]
+    return Measurement(result=result, run_times=[duration], peak_memory=peak,
+                       allocations=allocations, profile=str(path), **info)
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def format_timing(measurement: Measurement) -> str:
+    if measurement.cached:
+        return "cached"
+    if len(measurement.run_times) == 1:
+        return format_duration(measurement.min)
+    return (f"min {format_duration(measurement.min)}, "
+            f"median {format_duration(measurement.median)}, "
+            f"max {format_duration(measurement.max)}, "
+            f"load {format_duration(measurement.load_time)}")
+
+
+class Counter:
+    """Progress of a solver's loop, sampled by the harness while it runs."""
+    __slots__ = "name", "total", "count", "queue_size", "peak_queue"
+
+    def __init__(self, name: str, total: int | None = None):
+        self.name, self.total = name, total
+        self.count = self.queue_size = self.peak_queue = 0
+
+    def tick(self, n: int = 1):
+        self.count += n
+
+    def queue(self, size: int):
+        """Record the current size of the loop's work queue."""
+        self.queue_size = size
+        if size > self.peak_queue:
+            self.peak_queue = size
+
+    def format(self, rate: float | None = None, *, eta: bool = True) -> str:
+        text = f"{self.name}: {self.count:,}" + (f" / {self.total:,}" if self.total else "")
+        if rate is not None:
+            text += f", {rate:,.0f}/s"
+            if eta and self.total and rate:
+                text += f", ETA {format_duration(max(self.total - self.count, 0) / rate)}"
+        if self.peak_queue:
+            text += f", queue {self.queue_size:,} (peak {self.peak_queue:,})"
+        return text
+
+
+class NullCounter(Counter):
+    """Stand-in for counters in runs that are not instrumented."""
+    __slots__ = ()
+
+    def tick(self, n: int = 1):
+        pass
+
+    def queue(self, size: int):
+        pass
+
+NULL_COUNTER = NullCounter("disabled")
+COUNTERS: dict[str, Counter] = {}  # counters of the currently measured run
+
+
+def counter(name: str, total: int | None = None) -> Counter:
+    """Get the current run's counter of the given name. Without
+    instrumentation this is a shared no-op counter, so ticking it in hot
+    loops is almost free.
+    """
+    if not SETTINGS.counting:
+        return NULL_COUNTER
+    if (found := COUNTERS.get(name)) is None:
+        found = COUNTERS[name] = Counter(name, total)
+    return found
+
+
+@contextmanager
+def instrumented(label: str, interval: float = 1.):
+    """Collect the counters of the enclosed run. If instrumented, print
+    their rates and progress every `interval` seconds and a summary at the
+    end. The counters stay available until the next run starts.
+    """
+    COUNTERS.clear()
+    if not SETTINGS.instrument:
+        yield
+        return
+    done = threading.Event()
+
+    def sample():
+        previous = {}
+        last = start
+        while not done.wait(interval):
+            now = time.perf_counter()
+            for name, current in list(COUNTERS.items()):
+                rate = (current.count - previous.get(name, 0)) / (now - last)
+                previous[name] = current.count
+                print(f"[{label}] {current.format(rate)}", file=sys.stderr)
+            last = now
+
+    start = time.perf_counter()
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield
+    finally:
+        done.set()
+        sampler.join()
+        duration = time.perf_counter() - start
+        for current in COUNTERS.values():
+            rate = current.count / duration if duration else None
+            print(f"[{label}] {current.format(rate, eta=False)} in {format_duration(duration)}", file=sys.stderr)
+
+
+@cache
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(measurements: list[Measurement], path: str | os.PathLike):
+    """Append measurements to a JSONL file, one line per solver run."""
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with open(path, "a") as file:
+        for measurement in measurements:
+            record = {"timestamp": timestamp, "commit": get_commit(), **measurement.to_json()}
+            file.write(json.dumps(record) + "\n")
+
+
+def get_source_hash(fn: Callable) -> str:
+    """Hash the source of the module defining `fn` and of local modules it uses."""
+    module = sys.modules[fn.__module__]
+    root = Path(__file__).parent
+    used_modules = {module} | {
+        value if isinstance(value, ModuleType) else sys.modules.get(getattr(value, "__module__", None))
+        for value in vars(module).values()
+    }
+    sources = sorted({
+        Path(used.__file__) for used in used_modules
+        if used and used.__name__ != __name__ and getattr(used, "__file__", None)
+        and Path(used.__file__).parent == root
+    })
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Persistent solver results keyed by day, part, input and solver source.
+    Each entry is a separate file so that parallel workers don't conflict.
+    """
+    STATS_FILE = "stats.json"
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, solver: "Solver", input: Buffer) -> str:
+        input_hash = hashlib.sha256(input).hexdigest()[:16]
+        return f"day{solver.day:02}-part{solver.part}-{input_hash}-{get_source_hash(solver.fn)[:16]}"
+
+    def get(self, key: str) -> tuple[bool, object]:
+        try:
+            result = json.loads((self.directory / f"{key}.json").read_text())["result"]
+        except (OSError, ValueError, KeyError):
+            result = None
+        if result is None:  # missing results are never served, nor stored anymore
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, result
+
+    def put(self, key: str, result: object):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{key}.json").write_text(json.dumps({"result": result}))
+
+    def entries(self, days: Iterable[int] | None = None) -> list[Path]:
+        prefixes = None if days is None else tuple(f"day{day:02}-" for day in days)
+        return [path for path in sorted(self.directory.glob("day*.json"))
+                if prefixes is None or path.name.startswith(prefixes)]
+
+    def clear(self, days: Iterable[int] | None = None) -> int:
+        """Invalidate entries of the given days (default: all). Returns the number removed."""
+        entries = self.entries(days)
+        for path in entries:
+            path.unlink()
+        return len(entries)
+
+    def load_stats(self) -> dict[str, int]:
+        try:
+            return json.loads((self.directory / self.STATS_FILE).read_text())
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0}
+
+    def record_stats(self, hits: int, misses: int):
+        """Add hits and misses of a run to the persistent totals."""
+        stats = self.load_stats()
+        stats["hits"] += hits
+        stats["misses"] += misses
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / self.STATS_FILE).write_text(json.dumps(stats))
+
+RESULT_CACHE = ResultCache(STATE_DIR / "results")
+
+
+def is_immutable(value: object) -> bool:
+    """Whether the value and everything it contains is immutable, so that
+    it can be shared between solvers without copying.
+    """
+    match value:
+        case None | bool() | int() | float() | complex() | str() | bytes() | range() | Enum() | FunctionType():
+            return True
+        case tuple() | frozenset():
+            return all(map(is_immutable, value))
+        case MappingProxyType():
+            return all(map(is_immutable, value.values()))
+    if is_dataclass(value) and not isinstance(value, type) and value.__dataclass_params__.frozen:
+        return all(is_immutable(getattr(value, item.name)) for item in fields(value))
+    return False
+
+
+@dataclass
+class Parser:
+    """A day's input parser whose result is shared by the day's solvers."""
+    day: int
+    fn: Callable[[str], object]
+
+    @cached_property
+    def fingerprint(self) -> str:
+        return get_code_fingerprint(self.fn)
+
+
+class ParseCache:
+    """Parsed inputs keyed by day, parser and input, shared between
+    consecutive runs on the same input. Immutable results are handed out as
+    they are, mutable ones as a deep copy for each solver, so that no solver
+    sees another one's changes. Only the most recently used inputs are kept,
+    so batch and scaling runs over many inputs don't hold on to old ones.
+    """
+    def __init__(self, maxsize: int = 2):
+        self.maxsize = maxsize
+        self.entries: dict[tuple[int, str, str], tuple[object, bool]] = {}
+        self.hits = self.misses = 0
+
+    def get(self, parser: Parser, input: str) -> object:
+        key = parser.day, parser.fingerprint, hashlib.sha256(input.encode()).hexdigest()
+        if (entry := self.entries.pop(key, None)) is None:
+            self.misses += 1
+            parsed = parser.fn(input)
+            entry = parsed, is_immutable(parsed)
+            if len(self.entries) >= self.maxsize:
+                del self.entries[next(iter(self.entries))]  # least recently used
+        else:
+            self.hits += 1
+        self.entries[key] = entry
+        parsed, shared = entry
+        return parsed if shared else deepcopy(parsed)
+
+    def clear(self):
+        self.entries.clear()
+
+PARSE_CACHE = ParseCache()
+
+
+@dataclass
+class ScopedCache:
+    """Results memoized by a `scoped_cache` function during a solver run."""
+    name: str
+    maxsize: int | None = None
+    entries: dict[tuple, object] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+    def get_size(self) -> int:
+        """Approximate memory used by the entries in bytes, counting shared objects once."""
+        size = sys.getsizeof(self.entries)
+        seen = set()
+        for args, result in self.entries.items():
+            for item in (args, *args, result):
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    size += sys.getsizeof(item)
+        return size
+
+    def get_stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries), "bytes": self.get_size()}
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+
+SCOPED_CACHES: list[ScopedCache] = []
+MISSING = object()
+
+
+def scoped_cache[F: Callable](fn: F | None = None, *, maxsize: int | None = None) -> F:
+    """Replacement for `functools.cache` whose results only live as long
+    as a solver run, so that runs start cold and don't leak memory into
+    the next input. With `maxsize`, only the most recently used results
+    are kept. Usage statistics are reported after each part.
+    """
+    if fn is None:
+        return lambda fn: scoped_cache(fn, maxsize=maxsize)
+    scoped = ScopedCache(fn.__qualname__, maxsize)
+    SCOPED_CACHES.append(scoped)
+    entries = scoped.entries
+
+    if maxsize is None:
+        @wraps(fn)
+        def wrapped(*args):
+            if (result := entries.get(args, MISSING)) is not MISSING:
+                scoped.hits += 1
+                return result
+            scoped.misses += 1
+            result = entries[args] = fn(*args)
+            return result
+    else:
+        @wraps(fn)
+        def wrapped(*args):
+            if (result := entries.pop(args, MISSING)) is not MISSING:
+                scoped.hits += 1
+                entries[args] = result  # most recently used go last
+                return result
+            scoped.misses += 1
+            result = entries[args] = fn(*args)
+            if len(entries) > maxsize:
+                del entries[next(iter(entries))]
+            return result
+    wrapped.cache = scoped
+    return wrapped
+
+
+def clear_scoped_caches():
+    for scoped in SCOPED_CACHES:
+        scoped.clear()
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """Statistics of the scoped caches used since they were last cleared."""
+    return {scoped.name: scoped.get_stats() for scoped in SCOPED_CACHES if scoped.hits or scoped.misses}
+
+
+CHECKPOINT_DIR = STATE_DIR / "checkpoints"
+
+
+class Checkpoint:
+    """Loop state of a long-running solver, saved at intervals so that an
+    interrupted or killed run can resume where it left off.
+    """
+    def __init__(self, path: Path | None, interval: float):
+        self.path, self.interval = path, interval
+        self.last_save = time.monotonic()
+
+    def load[T](self, default: T) -> T:
+        """The most recently saved state, or `default` when starting fresh."""
+        if self.path is None or not self.path.is_file():
+            return default
+        try:
+            state = pickle.loads(self.path.read_bytes())
+        except Exception as error:
+            print(f"Ignoring unreadable checkpoint {self.path}: {error!r}", file=sys.stderr)
+            return default
+        print(f"Resuming from checkpoint {self.path}", file=sys.stderr)
+        return state
+
+    def due(self) -> bool:
+        """Whether the state should be saved again. Cheap enough to check every iteration."""
+        if self.path is None:
+            return False
+        return time.monotonic() - self.last_save >= self.interval or CURRENT_RUN.cancelling
+
+    def save(self, state: object):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_suffix(".part")
+        partial.write_bytes(pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+        partial.replace(self.path)
+        self.last_save = time.monotonic()
+        if CURRENT_RUN.cancelling:
+            raise Cancelled()
+
+    def remove(self):
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+@dataclass
+class RunContext:
+    """The solver run currently in progress."""
+    solver: "Solver"
+    input: str | Path
+    checkpoints: list[Checkpoint] = field(default_factory=list)
+    cancelling: bool = False  # checkpoints save right away, then the run is cancelled
+
+    @cached_property
+    def input_hash(self) -> str:
+        data = self.input.encode() if isinstance(self.input, str) else self.input.read_bytes()
+        return hashlib.sha256(data).hexdigest()
+
+CURRENT_RUN: RunContext | None = None
+
+
+def checkpoint(name: str = "state", *, interval: float = 30.) -> Checkpoint:
+    """Get the current run's checkpoint of the given name. It is keyed by
+    day, part, input and the solver's code, so that states never carry over
+    to other inputs or changed solvers, and removed when the run finishes.
+    Outside of solver runs or with checkpoints disabled, nothing is saved.
+    """
+    if CURRENT_RUN is None or not SETTINGS.checkpoints:
+        return Checkpoint(None, interval)
+    solver = CURRENT_RUN.solver
+    key = hashlib.sha256(f"{CURRENT_RUN.input_hash}:{get_code_fingerprint(solver.fn)}".encode()).hexdigest()
+    path = CHECKPOINT_DIR / f"day{solver.day:02}-part{solver.part}-{name}-{key[:16]}.pickle"
+    CURRENT_RUN.checkpoints.append(found := Checkpoint(path, interval))
+    return found
+
+
+@dataclass
+class Solver:
+    """A registered solution for one part of a day, with its examples."""
+    day: int
+    part: int
+    fn: Callable[[str], object]
+    examples: tuple[str, ...]
+    expected: tuple[object, ...]
+    stream: Literal["lines", "records"] | None = None
+
+    @property
+    def module(self) -> str:
+        return self.fn.__module__
+
+    @property
+    def importable_module(self) -> str:
+        """Name under which worker processes can import the solver's module."""
+        if self.module == "__main__":
+            return Path(sys.modules["__main__"].__file__).stem
+        return self.module
+
+    @property
+    def input_labels(self) -> list[str]:
+        return [f"example {idx}" for idx in range(1, min(len(self.examples), len(self.expected)) + 1)] + ["input"]
+
+    def solve(self, input: str | Path):
+        """Call the solver with input text or an input file, which streaming
+        solvers read lazily and others receive as one stripped string, or
+        parsed by the day's parser if it has one.
+        """
+        global CURRENT_RUN
+        clear_scoped_caches()  # every run starts cold
+        if not self.stream and not isinstance(input, str):
+            input = input.read_text().strip()
+        previous, CURRENT_RUN = CURRENT_RUN, RunContext(self, input)
+        try:
+            if self.stream:
+                result = self.fn(STREAM_READERS[self.stream](input))
+            elif parser := PARSERS.get(self.day):
+                result = self.fn(PARSE_CACHE.get(parser, input))
+            else:
+                result = self.fn(input)
+            for finished in CURRENT_RUN.checkpoints:
+                finished.remove()
+            return result
+        finally:
+            CURRENT_RUN = previous
+
+    def measure(self, label: str) -> Measurement:
+        """Run the solver on the example or real input with the given label.
+        For streaming solvers reading the input is part of the solver's time.
+        """
+        with instrumented(f"day {self.day} part {self.part} {label}"):
+            if label == "input":
+                if self.stream:
+                    load = lambda: INPUTS.path(day=self.day)
+                else:
+                    load = lambda: INPUTS.get(day=self.day).stripped
+                measurement = measure(self.solve, load, repeat=SETTINGS.repeat, day=self.day, part=self.part,
+                                      input=label)
+            else:
+                idx = int(label.removeprefix("example ")) - 1
+                measurement = measure(self.solve, self.examples[idx].strip, repeat=SETTINGS.repeat, day=self.day,
+                                      part=self.part, input=label, expected=self.expected[idx])
+        measurement.caches = get_cache_stats()
+        clear_scoped_caches()
+        return measurement
+
+    def run(self, *, on_measurement: Callable[[Measurement], None] | None = None) -> list[Measurement]:
+        """Check all examples, then solve the real input if they all passed.
+        If the input and the solver's source are unchanged since the last
+        successful run, the cached result is returned instead. Inputs that
+        haven't been downloaded yet are only fetched after the examples pass.
+        """
+        cache_key = None
+        caching = SETTINGS.cache and SETTINGS.repeat == 1 and not SETTINGS.profile
+        if caching and Path(INPUT_FILE_TEMPLATE.format(day=self.day)).is_file():
+            start = time.perf_counter()
+            cache_key = RESULT_CACHE.key(self, INPUTS.get(day=self.day).data)
+            found, result = RESULT_CACHE.get(cache_key)
+            if found:
+                measurement = Measurement(self.day, self.part, "input", result, cached=True,
+                                          run_times=[time.perf_counter() - start])
+                if on_measurement:
+                    on_measurement(measurement)
+                return [measurement]
+
+        import multiprocessing
+
+        if SETTINGS.speculative and not multiprocessing.current_process().daemon:
+            measurements = self.run_speculatively(on_measurement=on_measurement)
+        else:
+            measurements = []
+            for label in self.input_labels:
+                measurement = self.measure(label)
+                measurements.append(measurement)
+                if on_measurement:
+                    on_measurement(measurement)
+                if measurement.ok is False:
+                    break
+        if caching and measurements[-1].input == "input" and measurements[-1].result is not None:
+            cache_key = cache_key or RESULT_CACHE.key(self, INPUTS.get(day=self.day).data)
+            RESULT_CACHE.put(cache_key, measurements[-1].result)
+        if SETTINGS.report:
+            write_report(measurements, SETTINGS.report)
+        return measurements
+
+    def run_speculatively(self, *, on_measurement: Callable[[Measurement], None] | None = None) -> list[Measurement]:
+        """Run the examples and the real input at the same time in worker
+        processes. The real input's run is killed if any example fails.
+        """
+        import multiprocessing
+
+        measurements = []
+        with multiprocessing.Pool(len(self.input_labels)) as pool:
+            pending = [pool.apply_async(measure_job, (self.importable_module, self.day, self.part, label, SETTINGS))
+                       for label in self.input_labels]
+            for job in pending:
+                measurement = job.get()
+                measurements.append(measurement)
+                if on_measurement:
+                    on_measurement(measurement)
+                if measurement.ok is False:
+                    break  # leaving the pool terminates the remaining workers
+        return measurements
+
+
+SOLVERS: dict[tuple[int, int], Solver] = {}
+PARSERS: dict[int, Parser] = {}
+VARIANTS: dict[tuple[int, int], dict[str, Callable]] = {}
+
+
+def measure_job(module: str, day: int, part: int, label: str, settings: "Settings") -> Measurement:
+    """Measure one solver input. Executed inside worker processes."""
+    vars(SETTINGS).update(vars(settings))
+    importlib.import_module(module)
+    return SOLVERS[day, part].measure(label)
+
+
+def print_measurement(measurement: Measurement):
+    result = measurement.result
+    if measurement.expected is None:
+        print(f"### Part {measurement.part} solution: {result}  ({format_timing(measurement)})\n")
+    else:
+        check = '✅' if measurement.ok else f'!= {measurement.expected} ❌'
+        print(f"### Part {measurement.part} example:  {result} {check}  ({format_timing(measurement)})\n")
+    if measurement.peak_memory is not None:
+        print(f"Peak memory {format_bytes(measurement.peak_memory)}, profile written to {measurement.profile}")
+        if measurement.expected is None:
+            print("Top allocations at peak:", *measurement.allocations, sep="\n  ")
+        print()
+    if measurement.expected is None and measurement.caches:
+        for name, stats in measurement.caches.items():
+            calls = stats["hits"] + stats["misses"]
+            print(f"Cache {name}: {stats['entries']:,} entries, ~{format_bytes(stats['bytes'])}, "
+                  f"{stats['hits'] / calls:.0%} of {calls:,} calls hit")
+        print()
 
 
 def aoc(*, day: int, example: str | tuple[str, ...]):
+    """Create a decorator that registers solvers for the given day.
+    Solvers are only executed on import if their module is run as a script,
+    otherwise use `run` to execute them.
+    """
     if not isinstance(example, tuple):
         example = (example,)
-    def solution[T: int | str](*, part: int, expected: T | tuple[T, ...]):
+    def solution[T: int | str](*, part: int, expected: T | tuple[T, ...],
+                               stream: Literal["lines", "records"] | None = None):
+        """With `stream`, the solver receives an iterator over the input's
+        lines or blank-line separated records instead of one string.
+        """
         if not isinstance(expected, tuple):
             expected = (expected,)
-        def attempt(fn: Callable[[str], T]):
-            any_failed = False
-            for example_, expected_ in zip(example, expected):
-                result = fn(example_.strip())
-                any_failed |= result != expected_
-                print(f"### Part {part} example:  {result} {'✅' if result == expected_ else f'!= {expected_} ❌'}\n")
-            if not any_failed:
-                result = fn(get_input(day=day).strip())
-                print(f"### Part {part} solution: {result}\n")
+        def attempt[F: Callable](fn: F) -> F:
+            solver = SOLVERS[day, part] = Solver(day, part, fn, example, expected, stream)
+            if solver.module == "__main__":
+                solver.run(on_measurement=print_measurement)
+            return fn
         return attempt
+
+    def parser[F: Callable[[str], object]](fn: F) -> F:
+        """Register the day's parser. All non-streaming solvers of the day
+        then receive the parsed input instead of its text, which is parsed
+        only once for both parts. Register it before the solvers.
+        """
+        PARSERS[day] = Parser(day, fn)
+        return fn
+
+    def variant(*, part: int, name: str):
+        """Register an alternative implementation of a part, which
+        `aoc.py diff` cross-checks against the solver and benchmarks.
+        """
+        def register[F: Callable](fn: F) -> F:
+            VARIANTS.setdefault((day, part), {})[name] = fn
+            return fn
+        return register
+
+    solution.parser = parser
+    solution.variant = variant
     return solution
 
 
+DAY_MODULE_PATTERN = re.compile(r"day(\d+)\w*")
+
+def find_day_modules() -> dict[int, list[str]]:
+    """Map day numbers to the names of the modules solving them."""
+    modules: dict[int, list[str]] = {}
+    for path in sorted(Path(__file__).parent.glob("day*.py")):
+        if match := DAY_MODULE_PATTERN.fullmatch(path.stem):
+            modules.setdefault(int(match[1]), []).append(path.stem)
+    return modules
+
+
+def load_days(days: Iterable[int] | None = None) -> list[Solver]:
+    """Import day modules (registering their solvers) without running them."""
+    modules = find_day_modules()
+    for day in modules if days is None else days:
+        for module in modules.get(day, ()):
+            importlib.import_module(module)
+    return [solver for (day, _), solver in sorted(SOLVERS.items()) if days is None or day in days]
+
+
+def run(days: Iterable[int] | None = None, parts: Iterable[int] | None = None,
+        on_measurement: Callable[[Measurement], None] | None = print_measurement) -> list[Measurement]:
+    """Load and run the solvers of the given days and parts (default: all)."""
+    days = None if days is None else set(days)
+    parts = None if parts is None else set(parts)
+    measurements = []
+    current_day = None
+    for solver in load_days(days):
+        if parts is None or solver.part in parts:
+            if on_measurement and solver.day != current_day:
+                print(f"## Day {solver.day}\n")
+                current_day = solver.day
+            measurements.extend(solver.run(on_measurement=on_measurement))
+    report_cache_stats(RESULT_CACHE.hits, RESULT_CACHE.misses)
+    return measurements
+
+
+def report_cache_stats(hits: int, misses: int):
+    if hits or misses:
+        RESULT_CACHE.record_stats(hits, misses)
+        print(f"## Result cache: {hits} hits, {misses} misses\n")
+
+
+def get_stable_repr(value: object) -> str | None:
+    """Repr of plain data that is the same in every process, or None for
+    other values, whose reprs may contain memory addresses.
+    """
+    match value:
+        case None | bool() | int() | float() | complex() | str() | bytes() | range():
+            return repr(value)
+        case tuple() | list():
+            items = list(map(get_stable_repr, value))
+            return None if None in items else f"{type(value).__name__}({', '.join(items)})"
+        case set() | frozenset():
+            items = list(map(get_stable_repr, value))
+            return None if None in items else f"{type(value).__name__}({', '.join(sorted(items))})"
+        case dict():
+            items = list(map(get_stable_repr, value.items()))
+            return None if None in items else f"dict({', '.join(items)})"
+    return None
+
+
+def get_code_fingerprint(fn: Callable) -> str:
+    """Hash the bytecode of `fn` and of the functions and classes of its
+    module that it uses, directly or indirectly, and the values of other
+    globals it uses. Unlike `get_source_hash`, this stays the same when
+    only unrelated parts of the module change.
+    """
+    module = vars(sys.modules[fn.__module__])
+    digest = hashlib.sha256()
+    seen = set()
+
+    def visit_code(code: CodeType):
+        digest.update(code.co_code)
+        digest.update(repr([get_stable_repr(const) for const in code.co_consts if not isinstance(const, CodeType)]).encode())
+        for const in code.co_consts:
+            if isinstance(const, CodeType):
+                visit_code(const)
+        for name in code.co_names:
+            if name in module and name not in seen:
+                seen.add(name)
+                visit_value(name, module[name])
+
+    def visit_value(name: str, value: object):
+        digest.update(name.encode())
+        if (stable_repr := get_stable_repr(value)) is not None:
+            digest.update(stable_repr.encode())
+        elif getattr(value, "__module__", None) != fn.__module__:
+            pass  # imported
+        elif isinstance(value, type):
+            for attr, member in vars(value).items():
+                visit_value(attr, member)
+        elif code := getattr(inspect.unwrap(value), "__code__", None):
+            visit_code(code)
+
+    visit_code(inspect.unwrap(fn).__code__)
+    return digest.hexdigest()
+
+
+def reload_module(name: str) -> list[Solver]:
+    """Re-import a day module, replacing its registered solvers. If the
+    module fails to import, its previous solvers are kept.
+    """
+    previous = {key: solver for key, solver in SOLVERS.items() if solver.module == name}
+    previous_parsers = {day: parser for day, parser in PARSERS.items() if parser.fn.__module__ == name}
+    for key in previous:
+        del SOLVERS[key]
+    for day in previous_parsers:
+        del PARSERS[day]
+    previous_variants = {key: dict(variants) for key, variants in VARIANTS.items()}
+    for variants in VARIANTS.values():
+        for variant_name in [key for key, fn in variants.items() if fn.__module__ == name]:
+            del variants[variant_name]
+    try:
+        if name in sys.modules:
+            importlib.reload(sys.modules[name])
+        else:
+            importlib.import_module(name)
+    except BaseException:
+        SOLVERS.update(previous)
+        PARSERS.update(previous_parsers)
+        VARIANTS.update(previous_variants)
+        raise
+    return [solver for _, solver in sorted(SOLVERS.items()) if solver.module == name]
+
+
+def watch(days: Iterable[int] | None = None, parts: Iterable[int] | None = None, interval: float = .2):
+    """Keep solvers and inputs loaded and re-run parts whenever their day
+    module changes. Only the parts whose code changed are re-run, and the
+    time from saving the file to each result is reported.
+    """
+    days = None if days is None else set(days)
+    parts = None if parts is None else set(parts)
+    get_mtime = lambda name: Path(__file__).with_name(f"{name}.py").stat().st_mtime_ns
+    watched = {name: get_mtime(name) for day, names in find_day_modules().items()
+               if days is None or day in days for name in names}
+    def get_fingerprint(solver: Solver) -> str:
+        parser = None if solver.stream else PARSERS.get(solver.day)
+        return get_code_fingerprint(solver.fn) + (parser.fingerprint if parser else "")
+
+    fingerprints = {}
+    for solver in load_days(days):
+        if parts is None or solver.part in parts:
+            fingerprints[solver.day, solver.part] = get_fingerprint(solver)
+            INPUTS.get(day=solver.day).stripped  # keep the input mapped and decoded
+    print(f"Watching {len(watched)} modules, press Ctrl+C to stop\n")
+    try:
+        while True:
+            time.sleep(interval)
+            for day, names in find_day_modules().items():
+                for name in names:
+                    if (days is None or day in days) and name not in watched:
+                        watched[name] = 0  # new module
+            for name, mtime in watched.items():
+                try:
+                    if (changed := get_mtime(name)) == mtime:
+                        continue
+                except FileNotFoundError:
+                    continue  # editors may replace the file in several steps
+                watched[name] = changed
+                start = time.perf_counter()
+                try:
+                    solvers = reload_module(name)
+                except BaseException:
+                    print(f"## Reloading {name} failed\n\n{traceback.format_exc()}")
+                    continue
+                print(f"## Reloaded {name} in {format_duration(time.perf_counter() - start)}\n")
+                for solver in solvers:
+                    key = solver.day, solver.part
+                    if parts is not None and solver.part not in parts:
+                        continue
+                    if fingerprints.get(key) == (fingerprint := get_fingerprint(solver)):
+                        print(f"### Part {solver.part} unchanged\n")
+                        continue
+                    fingerprints[key] = fingerprint
+                    try:
+                        solver.run(on_measurement=print_measurement)
+                    except Exception:
+                        print(traceback.format_exc())
+                    print(f"Edit to result of day {solver.day} part {solver.part}: "
+                          f"{format_duration(time.time() - changed / 1e9)}\n")
+    except KeyboardInterrupt:
+        pass
+
+
+TIMINGS_FILE = STATE_DIR / "timings.json"
+
+
+def load_timings() -> dict[str, float]:
+    """Solver run times of the last parallel run, keyed by "day:part"."""
+    try:
+        return json.loads(TIMINGS_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_timings(timings: dict[str, float]):
+    STATE_DIR.mkdir(exist_ok=True)
+    TIMINGS_FILE.write_text(json.dumps(timings, indent=2, sort_keys=True))
+
+
+@dataclass
+class JobResult:
+    """Outcome of running one solver in a worker process."""
+    day: int
+    part: int
+    measurements: list[Measurement]
+    wall_time: float
+    cpu_time: float
+    error: str | None = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    limit: Literal["timeout", "memory"] | None = None
+    peak_rss: int | None = None
+    counters: list[str] = field(default_factory=list)
+
+
+def get_cpu_time() -> float:
+    """CPU time of this process and its terminated child processes"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def run_job(day: int, part: int, settings: Settings) -> JobResult:
+    """Run a single registered solver. Executed inside pool workers."""
+    vars(SETTINGS).update(vars(settings))
+    wall_start, cpu_start = time.perf_counter(), get_cpu_time()
+    hits, misses = RESULT_CACHE.hits, RESULT_CACHE.misses
+    try:
+        load_days([day])
+        measurements = SOLVERS[day, part].run()
+        error = None
+    except Exception:
+        measurements, error = [], traceback.format_exc()
+    return JobResult(day, part, measurements, time.perf_counter() - wall_start,
+                     get_cpu_time() - cpu_start, error,
+                     RESULT_CACHE.hits - hits, RESULT_CACHE.misses - misses)
+
+
+class Cancelled(BaseException):
+    """Raised inside a supervised job that exceeded its limits."""
+
+
+def raise_cancelled(signum: int, frame: object):
+    raise Cancelled()
+
+
+def request_cancel(signum: int, frame: object):
+    """Cancel the current run once its checkpoints saved their state, or
+    right away if it has none.
+    """
+    if CURRENT_RUN is None or not CURRENT_RUN.checkpoints:
+        raise Cancelled()
+    CURRENT_RUN.cancelling = True
+    # Give up on saving if the solver doesn't reach a checkpoint in time
+    signal.signal(signal.SIGALRM, raise_cancelled)
+    signal.setitimer(signal.ITIMER_REAL, CANCEL_GRACE_PERIOD / 2)
+
+
+def run_limited_job(day: int, part: int, settings: Settings, connection: "Connection"):
+    """Run a single solver inside a supervised process and send the result
+    through `connection`. SIGTERM cancels the solver after saving its
+    checkpoints, and it then still reports its counters.
+    """
+    signal.signal(signal.SIGTERM, request_cancel)
+    wall_start = time.perf_counter()
+    try:
+        result = run_job(day, part, settings)
+    except Cancelled:
+        result = JobResult(day, part, [], time.perf_counter() - wall_start, get_cpu_time(), "Cancelled")
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.setitimer(signal.ITIMER_REAL, 0)
+    result.counters = [counter.format() for counter in COUNTERS.values()]
+    connection.send(result)
+
+
+def get_rss(pid: int) -> int | None:
+    """Resident set size of a process in bytes, if /proc is available."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+LIMIT_POLL_INTERVAL = .05
+CANCEL_GRACE_PERIOD = 1.
+
+
+def supervise_job(day: int, part: int, settings: Settings) -> JobResult:
+    """Run a single solver in its own process, killing it if it exceeds
+    the time or memory limit of the settings.
+    """
+    import multiprocessing
+
+    # Forking from the supervising threads could deadlock, so start workers from a fork server.
+    context = multiprocessing.get_context("forkserver")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=run_limited_job, args=(day, part, settings, sender), daemon=False)
+    start = time.perf_counter()
+    process.start()
+    sender.close()
+    limit, peak_rss = None, 0
+    while not receiver.poll(LIMIT_POLL_INTERVAL) and process.is_alive():
+        peak_rss = max(peak_rss, get_rss(process.pid) or 0)
+        if settings.timeout is not None and time.perf_counter() - start > settings.timeout:
+            limit = "timeout"
+        elif settings.max_memory is not None and peak_rss > settings.max_memory:
+            limit = "memory"
+        if limit:
+            process.terminate()
+            if not receiver.poll(CANCEL_GRACE_PERIOD):
+                process.kill()
+            break
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = None
+    process.join()
+    if result is None:
+        result = JobResult(day, part, [], 0., 0., f"Worker died with exit code {process.exitcode}")
+    result.wall_time, result.peak_rss, result.limit = time.perf_counter() - start, peak_rss or None, limit
+    match limit:
+        case "timeout":
+            result.error = f"Exceeded the time limit of {format_duration(settings.timeout)}"
+        case "memory":
+            result.error = (f"Exceeded the memory limit of {format_bytes(settings.max_memory)} "
+                            f"(RSS {format_bytes(peak_rss)})")
+    return result
+
+
+def run_parallel(days: Iterable[int] | None = None, parts: Iterable[int] | None = None,
+                 jobs: int | None = None) -> list[JobResult]:
+    """Run solvers on a process pool, scheduling the slowest known ones first.
+    With time or memory limits, each solver runs in its own supervised
+    process instead, so that runaway solvers can be killed.
+    """
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+    days = None if days is None else set(days)
+    parts = None if parts is None else set(parts)
+    solvers = [solver for solver in load_days(days) if parts is None or solver.part in parts]
+    if get_missing_inputs({solver.day for solver in solvers}):
+        asyncio.run(prefetch_inputs({solver.day for solver in solvers}))
+    timings = load_timings()
+    # Solvers that never ran before are treated as slow so they don't end up last.
+    solvers.sort(key=lambda solver: timings.get(f"{solver.day}:{solver.part}", float("inf")), reverse=True)
+
+    results = []
+    wall_start = time.perf_counter()
+    if SETTINGS.timeout is None and SETTINGS.max_memory is None:
+        pool, job = ProcessPoolExecutor(max_workers=jobs), run_job
+    else:
+        pool, job = ThreadPoolExecutor(max_workers=jobs or os.cpu_count()), supervise_job
+    with pool:
+        futures = [pool.submit(job, solver.day, solver.part, SETTINGS) for solver in solvers]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print_job_result(result)
+            if not result.error and not any(m.cached for m in result.measurements):
+                timings[f"{result.day}:{result.part}"] = result.wall_time
+    wall_time = time.perf_counter() - wall_start
+    save_timings(timings)
+
+    report_cache_stats(sum(result.cache_hits for result in results),
+                       sum(result.cache_misses for result in results))
+    cpu_time = sum(result.cpu_time for result in results)
+    print(f"## {len(results)} parts in {format_duration(wall_time)} wall time, "
+          f"{format_duration(cpu_time)} CPU time ({cpu_time / wall_time:.1f}x)")
+    return sorted(results, key=lambda result: (result.day, result.part))
+
+
+def print_job_result(result: JobResult):
+    peak_rss = f", peak RSS {format_bytes(result.peak_rss)}" if result.peak_rss else ""
+    print(f"## Day {result.day} part {result.part} ({format_duration(result.wall_time)}{peak_rss})\n")
+    for measurement in result.measurements:
+        print_measurement(measurement)
+    if result.error:
+        print(result.error)
+    if result.error and result.counters:
+        print("Counters when it stopped:", *result.counters, sep="\n  ")
+
+
 
 def print_args(fn):
     """Utility decorator for debugging.
@@ -56,3 +1469,512 @@ def print_args(fn):
         print(*args, "->", result)
         return result
     return wrapped
+
+
+TRACE_REPR = reprlib.Repr(maxlevel=3, maxstring=40, maxother=40)
+
+
+@dataclass
+class CallTrace:
+    """Statistics and the most recent sampled calls of a traced function.
+    The time only counts outermost activations, so recursive calls are not
+    counted several times.
+    """
+    name: str
+    records: deque[str]
+    calls: int = 0
+    time: float = 0.
+    depth: int = 0
+
+    def record(self, args: tuple, kwargs: dict, outcome: str, duration: float):
+        arguments = [*map(TRACE_REPR.repr, args), *(f"{key}={TRACE_REPR.repr(value)}" for key, value in kwargs.items())]
+        self.records.append(f"{self.name}({', '.join(arguments)}) {outcome}  ({format_duration(duration)})")
+
+    def dump(self, file: TextIO = sys.stderr):
+        print(f"## {self.name}: {self.calls:,} calls, {format_duration(self.time)} total", file=file)
+        print(*self.records, sep="\n", file=file)
+
+
+TRACES: dict[str, CallTrace] = {}
+
+
+def dump_traces(file: TextIO = sys.stderr):
+    """Print all traced functions' statistics and recorded calls."""
+    for trace in TRACES.values():
+        trace.dump(file)
+
+
+def trace_calls[F: Callable](fn: F | None = None, *, maxlen: int = 20, sample: float = 1.) -> F:
+    """Debugging decorator that is cheap enough for hot, recursive code.
+    Counts and times all calls of the decorated function but only records
+    a `sample` fraction of them, keeping the last `maxlen` records. The
+    records are printed on uncaught exceptions, on SIGUSR1 or with
+    `dump_traces`. Generator functions are timed until they are exhausted.
+    """
+    if fn is None:
+        return lambda fn: trace_calls(fn, maxlen=maxlen, sample=sample)
+    trace = TRACES[fn.__qualname__] = CallTrace(fn.__qualname__, deque(maxlen=maxlen))
+    if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGUSR1, lambda signum, frame: dump_traces())
+
+    def enter() -> float:
+        trace.calls += 1
+        trace.depth += 1
+        return time.perf_counter()
+
+    def leave(start: float) -> float | None:
+        """Account for a finished call, returning its duration if it should be recorded."""
+        duration = time.perf_counter() - start
+        trace.depth -= 1
+        if trace.depth == 0:
+            trace.time += duration
+        return duration if random.random() < sample else None
+
+    def fail(start: float, args: tuple, kwargs: dict, outcome: str):
+        leave(start)
+        trace.record(args, kwargs, outcome, time.perf_counter() - start)
+        if trace.depth == 0:
+            trace.dump()
+
+    if inspect.isgeneratorfunction(fn):
+        @wraps(fn)
+        def wrapped(*args, **kwargs):
+            start, items = enter(), 0
+            try:
+                for item in fn(*args, **kwargs):
+                    items += 1
+                    yield item
+            except GeneratorExit:
+                if (duration := leave(start)) is not None:
+                    trace.record(args, kwargs, f"closed after {items} items", duration)
+                raise
+            except Exception as error:
+                fail(start, args, kwargs, f"raised {error!r} after {items} items")
+                raise
+            if (duration := leave(start)) is not None:
+                trace.record(args, kwargs, f"yielded {items} items", duration)
+    else:
+        @wraps(fn)
+        def wrapped(*args, **kwargs):
+            start = enter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as error:
+                fail(start, args, kwargs, f"raised {error!r}")
+                raise
+            if (duration := leave(start)) is not None:
+                trace.record(args, kwargs, f"-> {TRACE_REPR.repr(result)}", duration)
+            return result
+    wrapped.trace = trace
+    return wrapped
+
+
+def run_scaling(days: Iterable[int] | None = None, parts: Iterable[int] | None = None,
+                sizes: Iterable[int] | None = None, max_time: float = 10.0, seed: int = 0) -> list[Measurement]:
+    """Run solvers on generated inputs of growing size and estimate the
+    exponent k of their empirical O(n^k) run time from a log-log fit.
+    Sizes stop growing once a run takes longer than `max_time` seconds.
+    """
+    from generators import GENERATORS, generate
+
+    measurements = []
+    for generator in sorted(GENERATORS.values(), key=lambda generator: generator.day):
+        if days is not None and generator.day not in days:
+            continue
+        load_days([generator.day])
+        for part in generator.parts:
+            if (parts is not None and part not in parts) or (generator.day, part) not in SOLVERS:
+                continue
+            print(f"## Day {generator.day} part {part} by {generator.parameter}\n")
+            print(f"{'size':>10}  {'median':>10}  {'exponent':>8}")
+            points = []
+            for size in sizes or generator.sizes:
+                input = generate(generator.day, size, seed).strip()
+                try:
+                    measurement = measure(SOLVERS[generator.day, part].solve, lambda: input, repeat=SETTINGS.repeat,
+                                          day=generator.day, part=part, input=f"generated {size}")
+                except Exception as error:
+                    print(f"{size:>10}  failed: {error!r}")
+                    break
+                measurements.append(measurement)
+                exponent = (f"{math.log(measurement.median / points[-1][1]) / math.log(size / points[-1][0]):8.2f}"
+                            if points and size != points[-1][0] else "")
+                points.append((size, measurement.median))
+                print(f"{size:>10}  {format_duration(measurement.median):>10}  {exponent}")
+                if measurement.median > max_time:
+                    break
+            if len({size for size, _ in points}) > 1:
+                fit = statistics.linear_regression([math.log(size) for size, _ in points],
+                                                   [math.log(duration) for _, duration in points])
+                print(f"\n~O(n^{fit.slope:.2f}) with n = {generator.parameter}")
+            print()
+    if SETTINGS.report:
+        write_report(measurements, SETTINGS.report)
+    return measurements
+
+
+def find_inputs(patterns: Iterable[str]) -> Iterator[Path]:
+    """Files in the given directories or matching the given glob patterns"""
+    for pattern in patterns:
+        if (path := Path(pattern)).is_dir():
+            yield from sorted(child for child in path.iterdir() if child.is_file())
+        else:
+            yield from map(Path, sorted(glob.glob(pattern)))
+
+
+def init_batch_worker(day: int, settings: Settings):
+    vars(SETTINGS).update(vars(settings))
+    load_days([day])
+
+
+def solve_file(job: tuple[int, int, Path]) -> dict:
+    """Run one solver on one input file. Executed inside batch workers."""
+    day, part, path = job
+    record: dict[str, object] = {"input": str(path), "day": day, "part": part}
+    start = time.perf_counter()
+    try:
+        record["result"] = SOLVERS[day, part].solve(path)
+    except Exception as error:
+        record["error"] = repr(error)
+    record["time_s"] = time.perf_counter() - start
+    return record
+
+
+def run_batch(day: int, patterns: Iterable[str], parts: Iterable[int] | None = None,
+              jobs: int | None = None, output: TextIO = sys.stdout) -> int:
+    """Stream many input files for one day through a worker pool, writing
+    one JSON line per input and part. Returns the number of failed runs.
+    """
+    import multiprocessing
+
+    load_days([day])
+    parts = [part for part in (parts or (1, 2)) if (day, part) in SOLVERS]
+    work = ((day, part, path) for path in find_inputs(patterns) for part in parts)
+    failures = runs = 0
+    inputs = set()
+    start = time.perf_counter()
+    with multiprocessing.Pool(jobs, initializer=init_batch_worker, initargs=(day, SETTINGS)) as pool:
+        for record in pool.imap_unordered(solve_file, work):
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+            runs += 1
+            inputs.add(record["input"])
+            failures += "error" in record
+    duration = time.perf_counter() - start
+    print(f"## {len(inputs)} inputs ({runs} runs) in {format_duration(duration)}, "
+          f"{len(inputs) / duration:.1f} inputs/s, {failures} failed", file=sys.stderr)
+    return failures
+
+
+def get_diff_inputs(solver: Solver, sizes: Iterable[int] | None = None, seeds: int = 3) -> Iterator[tuple[str, str]]:
+    """Labelled examples, real input and generated inputs to cross-check variants on."""
+    from generators import GENERATORS, generate
+
+    for idx in range(min(len(solver.examples), len(solver.expected))):
+        yield f"example {idx + 1}", solver.examples[idx].strip()
+    if Path(INPUT_FILE_TEMPLATE.format(day=solver.day)).is_file():
+        yield "input", INPUTS.get(day=solver.day).stripped
+    if (generator := GENERATORS.get(solver.day)) and solver.part in generator.parts:
+        for size in sizes or generator.sizes[:3]:
+            for seed in range(seeds):
+                yield f"{generator.parameter}={size} seed={seed}", generate(solver.day, size, seed).strip()
+
+
+def run_variant(solver: Solver, input: str, repeat: int = 1) -> tuple[object, float]:
+    """Result (or the repr of the raised exception) and fastest time of a solver."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            outcome = solver.solve(input)
+        except Exception as error:
+            return f"raised {error!r}", time.perf_counter() - start
+        times.append(time.perf_counter() - start)
+    return outcome, min(times)
+
+
+def minimize_input(input: str, is_failing: Callable[[str], bool]) -> str:
+    """Remove chunks of lines, then single lines, while the input keeps failing."""
+    lines = input.split("\n")
+    chunk = max(len(lines) // 2, 1)
+    while True:
+        idx, removed = 0, False
+        while idx < len(lines) and len(lines) > 1:
+            candidate = lines[:idx] + lines[idx + chunk:]
+            if candidate and is_failing("\n".join(candidate)):
+                lines, removed = candidate, True
+            else:
+                idx += chunk
+        if chunk == 1 and not removed:
+            return "\n".join(lines)
+        chunk = max(chunk // 2, 1)
+
+
+def run_diff(days: Iterable[int] | None = None, parts: Iterable[int] | None = None,
+             sizes: Iterable[int] | None = None, seeds: int = 3) -> int:
+    """Cross-check all variants of the given days' solvers against the
+    solvers on examples, real and generated inputs, printing a table of
+    times and speedups and a minimized input for each mismatch.
+    Returns the number of mismatches.
+    """
+    mismatches = 0
+    for solver in load_days(days):
+        if (parts is not None and solver.part not in parts) or not VARIANTS.get((solver.day, solver.part)):
+            continue
+        variants = {name: replace(solver, fn=fn) for name, fn in VARIANTS[solver.day, solver.part].items()}
+        print(f"## Day {solver.day} part {solver.part}\n")
+        print(f"{'input':<24} {'reference':>12}" + "".join(f" {name:>22}" for name in variants))
+        totals = dict.fromkeys(["reference", *variants], 0.)
+        failures = []
+        for label, input in get_diff_inputs(solver, sizes, seeds):
+            if parser := None if solver.stream else PARSERS.get(solver.day):
+                PARSE_CACHE.get(parser, input)  # so that no implementation pays for parsing
+            expected, reference_time = run_variant(solver, input, SETTINGS.repeat)
+            totals["reference"] += reference_time
+            row = f"{label:<24} {format_duration(reference_time):>12}"
+            for name, variant in variants.items():
+                outcome, variant_time = run_variant(variant, input, SETTINGS.repeat)
+                totals[name] += variant_time
+                if outcome == expected:
+                    row += f" {format_duration(variant_time):>12} ({reference_time / variant_time:5.1f}x)"
+                else:
+                    row += f" {'mismatch':>22}"
+                    failures.append((label, name, variant, input))
+            print(row)
+        print(f"{'total':<24} {format_duration(totals['reference']):>12}"
+              + "".join(f" {format_duration(totals[name]):>12} ({totals['reference'] / totals[name]:5.1f}x)"
+                        for name in variants) + "\n")
+
+        for label, name, variant, input in failures:
+            def is_failing(candidate: str) -> bool:
+                expected, _ = run_variant(solver, candidate)
+                outcome, _ = run_variant(variant, candidate)
+                return outcome != expected and not (isinstance(expected, str) and expected.startswith("raised "))
+            minimized = minimize_input(input, is_failing)
+            expected, outcome = run_variant(solver, minimized)[0], run_variant(variant, minimized)[0]
+            print(f"### {name} mismatch on {label}: {outcome!r} != {expected!r}, minimized input:\n\n{minimized}\n")
+        mismatches += len(failures)
+    return mismatches
+
+
+BASELINE_FILE = STATE_DIR / "baseline.json"
+
+
+def measure_peak_memory(fn: Callable[[str | Path], object], input: str | Path) -> int:
+    """Peak memory traced by tracemalloc during one run of the solver, parsing included."""
+    PARSE_CACHE.clear()
+    tracemalloc.start()
+    try:
+        fn(input)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def collect_baseline(days: Iterable[int] | None = None, parts: Iterable[int] | None = None,
+                     repeat: int = 5) -> dict[str, dict]:
+    """Median run time, peak memory and result of each solver on its real input.
+    Runs sequentially to keep timings free of interference between jobs.
+    """
+    baseline = {}
+    for solver in load_days(None if days is None else set(days)):
+        if parts is not None and solver.part not in parts:
+            continue
+        input = INPUTS.path(day=solver.day) if solver.stream else INPUTS.get(day=solver.day).stripped
+        measurement = measure(solver.solve, lambda: input, repeat=repeat,
+                              day=solver.day, part=solver.part, input="input")
+        baseline[f"{solver.day}:{solver.part}"] = {
+            "median_s": measurement.median,
+            "peak_bytes": measure_peak_memory(solver.solve, input),
+            "result": measurement.result,
+        }
+        print(f"Day {solver.day:>2} part {solver.part}: {format_duration(measurement.median)}, "
+              f"{format_bytes(baseline[f'{solver.day}:{solver.part}']['peak_bytes'])}")
+    return baseline
+
+
+def compare_baseline(baseline: dict[str, dict], current: dict[str, dict], *, time_threshold: float,
+                     memory_threshold: float, min_time: float) -> list[str]:
+    """Print a comparison table and return the keys of regressed solvers.
+    Time regressions must also exceed `min_time` seconds to filter out noise.
+    """
+    regressions = []
+    print(f"\n{'':>8}  {'median time':^31}  {'peak memory':^31}")
+    print(f"{'day:part':>8}  {'baseline':>10}  {'now':>10}  {'change':>7}  "
+          f"{'baseline':>10}  {'now':>10}  {'change':>7}")
+    for key in sorted(current.keys() & baseline.keys(), key=lambda key: tuple(map(int, key.split(":")))):
+        old, new = baseline[key], current[key]
+        time_change = new["median_s"] / old["median_s"] - 1 if old["median_s"] else 0.
+        memory_change = new["peak_bytes"] / old["peak_bytes"] - 1 if old["peak_bytes"] else 0.
+        problems = []
+        if time_change > time_threshold and new["median_s"] - old["median_s"] > min_time:
+            problems.append("slower")
+        if memory_change > memory_threshold:
+            problems.append("larger")
+        if new["result"] != old["result"]:
+            problems.append("different result")
+        if problems:
+            regressions.append(key)
+        print(f"{key:>8}  {format_duration(old['median_s']):>10}  {format_duration(new['median_s']):>10}  "
+              f"{time_change:>+7.0%}  {format_bytes(old['peak_bytes']):>10}  {format_bytes(new['peak_bytes']):>10}  "
+              f"{memory_change:>+7.0%}  {'❌ ' + ', '.join(problems) if problems else '✅'}")
+    for key in sorted(baseline.keys() - current.keys()):
+        print(f"{key:>8}  not measured")
+    return regressions
+
+
+def parse_days(specs: Iterable[str]) -> list[int] | None:
+    """Parse day arguments like `5`, `12-17`."""
+    days = []
+    for spec in specs:
+        start, _, stop = spec.partition("-")
+        days.extend(range(int(start), int(stop or start) + 1))
+    return days or None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=f"Advent of Code {YEAR} harness")
+    parser.add_argument("--repeat", type=int, default=SETTINGS.repeat,
+                        help="number of timed runs per solver and input")
+    parser.add_argument("--report", default=SETTINGS.report, help="append measurements to this JSONL file")
+    parser.add_argument("--profile", action="store_true", default=SETTINGS.profile,
+                        help="run solvers under cProfile and tracemalloc, writing pstats to .aoc/profiles")
+    parser.add_argument("--speculative", action="store_true", default=SETTINGS.speculative,
+                        help="run examples and the real input concurrently, discarding the result on failures")
+    parser.add_argument("--instrument", action="store_true", default=SETTINGS.instrument,
+                        help="report the progress of solvers' loop counters while they run")
+    parser.add_argument("--input-url", default=SETTINGS.input_url,
+                        help="URL template for downloading inputs, e.g. of a local stand-in server")
+    parser.add_argument("--no-checkpoints", dest="checkpoints", action="store_false", default=SETTINGS.checkpoints,
+                        help="neither resume from nor save checkpoints of long-running solvers")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", default=SETTINGS.cache,
+                        help="always recompute instead of using cached results")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run solvers on a process pool")
+    run_parser.add_argument("days", nargs="*", help="days or ranges of days, e.g. 5 12-17 (default: all)")
+    run_parser.add_argument("-p", "--parts", type=int, nargs="+", choices=(1, 2))
+    run_parser.add_argument("-j", "--jobs", type=int, help="number of worker processes (default: CPU count)")
+    run_parser.add_argument("--timeout", type=float, default=SETTINGS.timeout,
+                            help="kill parts running longer than this many seconds")
+    run_parser.add_argument("--max-memory", type=lambda mib: int(float(mib) * 2**20),
+                            default=SETTINGS.max_memory, help="kill parts whose RSS exceeds this many MiB")
+
+    cache_parser = commands.add_parser("cache", help="show or invalidate cached results")
+    cache_parser.add_argument("days", nargs="*", help="days or ranges of days (default: all)")
+    cache_parser.add_argument("--clear", action="store_true", help="remove cached results")
+
+    fetch_parser = commands.add_parser("fetch", help="download all missing inputs concurrently")
+    fetch_parser.add_argument("days", nargs="*", help="days or ranges of days (default: 1-25)")
+    fetch_parser.add_argument("-j", "--jobs", type=int, default=5, help="number of parallel connections")
+    fetch_parser.add_argument("--retries", type=int, default=3)
+
+    serve_parser = commands.add_parser("serve", help="serve input files as a local stand-in for the website")
+    serve_parser.add_argument("directory", type=Path)
+    serve_parser.add_argument("--port", type=int, default=8023)
+    serve_parser.add_argument("--delay", type=float, default=0., help="simulated latency per request in seconds")
+
+    batch_parser = commands.add_parser("batch", help="run one day on many input files")
+    batch_parser.add_argument("day", type=int)
+    batch_parser.add_argument("inputs", nargs="+", help="directories or glob patterns of input files")
+    batch_parser.add_argument("-p", "--parts", type=int, nargs="+", choices=(1, 2))
+    batch_parser.add_argument("-j", "--jobs", type=int, help="number of worker processes (default: CPU count)")
+    batch_parser.add_argument("-o", "--output", type=argparse.FileType("w"), default=sys.stdout,
+                              help="write JSON lines to this file instead of stdout")
+
+    baseline_parser = commands.add_parser("baseline", help="save or compare against a timing baseline")
+    baseline_parser.add_argument("action", choices=("save", "compare"))
+    baseline_parser.add_argument("days", nargs="*", help="days or ranges of days (default: all)")
+    baseline_parser.add_argument("-p", "--parts", type=int, nargs="+", choices=(1, 2))
+    baseline_parser.add_argument("-f", "--file", type=Path, default=BASELINE_FILE)
+    baseline_parser.add_argument("-r", "--runs", type=int, default=5, help="timed runs per solver")
+    baseline_parser.add_argument("-t", "--threshold", type=float, default=.2,
+                                 help="allowed relative increase of the median time")
+    baseline_parser.add_argument("-m", "--memory-threshold", type=float, default=.2,
+                                 help="allowed relative increase of the peak memory")
+    baseline_parser.add_argument("--min-time", type=float, default=.001,
+                                 help="ignore time increases smaller than this many seconds")
+
+    diff_parser = commands.add_parser("diff", help="cross-check and benchmark registered solver variants")
+    diff_parser.add_argument("days", nargs="*", help="days or ranges of days (default: all)")
+    diff_parser.add_argument("-p", "--parts", type=int, nargs="+", choices=(1, 2))
+    diff_parser.add_argument("-s", "--sizes", type=int, nargs="+",
+                             help="sizes of generated inputs (default: each day's three smallest)")
+    diff_parser.add_argument("--seeds", type=int, default=3, help="generated inputs per size")
+
+    watch_parser = commands.add_parser("watch", help="re-run solvers whenever their module is saved")
+    watch_parser.add_argument("days", nargs="*", help="days or ranges of days (default: all)")
+    watch_parser.add_argument("-p", "--parts", type=int, nargs="+", choices=(1, 2))
+    watch_parser.add_argument("-i", "--interval", type=float, default=.2, help="seconds between checks")
+
+    scale_parser = commands.add_parser("scale", help="benchmark solvers on generated inputs of growing size")
+    scale_parser.add_argument("days", nargs="*", help="days or ranges of days (default: all)")
+    scale_parser.add_argument("-p", "--parts", type=int, nargs="+", choices=(1, 2))
+    scale_parser.add_argument("-s", "--sizes", type=int, nargs="+", help="override each day's default sizes")
+    scale_parser.add_argument("--max-time", type=float, default=10.0,
+                              help="stop growing sizes after a run took this many seconds")
+    scale_parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    SETTINGS.repeat, SETTINGS.report, SETTINGS.cache = args.repeat, args.report, args.cache
+    SETTINGS.checkpoints = args.checkpoints
+    SETTINGS.profile, SETTINGS.speculative = args.profile, args.speculative
+    SETTINGS.input_url, SETTINGS.instrument = args.input_url, args.instrument
+
+    match args.command:
+        case "run":
+            SETTINGS.timeout, SETTINGS.max_memory = args.timeout, args.max_memory
+            results = run_parallel(parse_days(args.days), args.parts, args.jobs)
+            failed = any(result.error or any(m.ok is False for m in result.measurements) for result in results)
+            return int(failed)
+        case "diff":
+            mismatches = run_diff(parse_days(args.days), args.parts, args.sizes, args.seeds)
+            if mismatches:
+                print(f"{mismatches} mismatches")
+            return int(mismatches > 0)
+        case "watch":
+            watch(parse_days(args.days), args.parts, args.interval)
+        case "scale":
+            run_scaling(parse_days(args.days), args.parts, args.sizes, args.max_time, args.seed)
+        case "fetch":
+            import asyncio
+
+            start = time.perf_counter()
+            outcomes = asyncio.run(prefetch_inputs(parse_days(args.days) or range(1, 26),
+                                                   concurrency=args.jobs, retries=args.retries))
+            print(f"## Downloaded {sum(error is None for error in outcomes.values())} of {len(outcomes)} "
+                  f"missing inputs in {format_duration(time.perf_counter() - start)}")
+            return int(any(outcomes.values()))
+        case "serve":
+            serve_inputs(args.directory, port=args.port, delay=args.delay)
+        case "batch":
+            return int(run_batch(args.day, args.inputs, args.parts, args.jobs, args.output) > 0)
+        case "baseline":
+            SETTINGS.profile = False
+            current = collect_baseline(parse_days(args.days), args.parts, args.runs)
+            if args.action == "save":
+                args.file.parent.mkdir(parents=True, exist_ok=True)
+                args.file.write_text(json.dumps(current, indent=2))
+                print(f"Saved baseline of {len(current)} parts to {args.file}")
+            else:
+                baseline = json.loads(args.file.read_text())
+                regressions = compare_baseline(baseline, current, time_threshold=args.threshold,
+                                               memory_threshold=args.memory_threshold, min_time=args.min_time)
+                if regressions:
+                    print(f"\n{len(regressions)} regressions: {', '.join(regressions)}")
+                    return 1
+        case "cache":
+            days = parse_days(args.days)
+            if args.clear:
+                print(f"Removed {RESULT_CACHE.clear(days)} cached results")
+            else:
+                stats = RESULT_CACHE.load_stats()
+                print(f"{len(RESULT_CACHE.entries(days))} cached results, "
+                      f"{stats['hits']} hits, {stats['misses']} misses in total")
+    return 0
+
+
+if __name__ == "__main__":
+    # Run through the importable module so day modules share its solver registry.
+    from aoc import main
+    sys.exit(main())
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+from collections.abc import Iterable
+
 from aoc import aoc
 
 attempt = aoc(day=1, example="""
@@ -9,10 +11,10 @@ a1b2c3d4e5f
 treb7uchet
 """)
 
-@attempt(part=1, expected=142)
-def solve_1(input):
+@attempt(part=1, expected=142, stream="lines")
+def solve_1(lines: Iterable[str]):
     result = 0
-    for line in input.split("\n"):
+    for line in lines:
         digits = tuple(filter(str.isdigit, line))
         result += int(f"{digits[0]}{digits[-1]}")
     return result
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import re
+from collections.abc import Iterable
 from functools import reduce
 from operator import mul
 
@@ -17,8 +18,8 @@ Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green
 
 ZERO_SET = {"red": 0, "green": 0, "blue": 0}
 
-def parse(lines: str):
-    for line in lines.strip().split("\n"):
+def parse(lines: Iterable[str]):
+    for line in lines:
         matches = re.findall(r"(\d+) (red|green|blue)(,|;|$)", line)
         sets = []
         current_set = {**ZERO_SET}
@@ -29,17 +30,17 @@ def parse(lines: str):
                 current_set = {**ZERO_SET}
         yield sets
 
-def find_invalid(lines: str, maxima: dict):
+def find_invalid(lines: Iterable[str], maxima: dict):
     for idx, game in enumerate(parse(lines)):
         if not any(maxima[color] < count for colorset in game for color, count in colorset.items()):
             yield idx + 1
 
-@attempt(part=1, expected=8)
-def solve_1(lines: str):
+@attempt(part=1, expected=8, stream="lines")
+def solve_1(lines: Iterable[str]):
     return sum(find_invalid(lines, { "red": 12, "green": 13, "blue": 14}))
 
-@attempt(part=2, expected=2286)
-def solve_2(lines: str):
+@attempt(part=2, expected=2286, stream="lines")
+def solve_2(lines: Iterable[str]):
     result = 0
     for game in parse(lines):
         min_set = {color: max(gameset[color] for gameset in game) for color in ("red", "green", "blue")}
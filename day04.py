@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 
 import re
-from functools import cache
-
+from collections import deque
+from collections.abc import Iterable
 from aoc import aoc
 
 attempt = aoc(day=4, example="""
@@ -19,23 +19,24 @@ SPACES_PATTERN = re.compile(r"\s+")
 def parse_card(card):
     return tuple(map(SPACES_PATTERN.split, re.split(r":\s+", card)[1].split(" | ")))
 
-@cache
 def evaluate_card(card):
     winning, own = parse_card(card)
     return len(set(winning) & set(own))
 
-@attempt(part=1, expected=13)
-def solve_1(input):
-    cards = input.strip().split("\n")
+@attempt(part=1, expected=13, stream="lines")
+def solve_1(cards: Iterable[str]):
     return sum(2 ** (n - 1) for n in map(evaluate_card, cards) if n)
 
-@attempt(part=2, expected=30)
-def solve_2(input):
-    cards = input.strip().split("\n")
-    counters = [1 for _ in cards]
-    for idx, card in enumerate(cards):
-        # print(idx, range(idx, min(idx + evaluate_card(card), len(cards))))
-        for bonus_idx in range(idx, min(idx + evaluate_card(card), len(cards))):
-            counters[bonus_idx + 1] += counters[idx]
-    # print(counters)
-    return sum(counters)
+@attempt(part=2, expected=30, stream="lines")
+def solve_2(cards: Iterable[str]):
+    # Only copies won for the upcoming cards need to be remembered.
+    bonuses = deque[int]()
+    total = 0
+    for card in cards:
+        count = 1 + (bonuses.popleft() if bonuses else 0)
+        total += count
+        matches = evaluate_card(card)
+        bonuses.extend(0 for _ in range(matches - len(bonuses)))
+        for idx in range(matches):
+            bonuses[idx] += count
+    return total
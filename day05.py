@@ -46,14 +46,13 @@ humidity-to-location map:
 def parse_seeds(lines):
     return map(int, lines[0].split(": ")[1].split(" "))
 
-def parse_seed_ranges(lines):
-    ns = tuple(parse_seeds(lines))
-    for start, length in batched(ns, 2):
+def get_seed_ranges(seeds):
+    for start, length in batched(seeds, 2):
         yield range(start, start + length)
 
-@dataclass
+@dataclass(frozen=True)
 class Mapping:
-    range_pairs: list[tuple[range, range]]
+    range_pairs: tuple[tuple[range, range], ...]
 
     def get(self, n: int) -> int:
         for src, dest in self.range_pairs:
@@ -80,15 +79,18 @@ def parse_mappings(lines):
             dest_start, src_start, length = map(int, line.split(" "))
             range_pairs.append((range(src_start, src_start + length), range(dest_start, dest_start + length)))
         except ValueError:
-            yield Mapping(range_pairs)
+            yield Mapping(tuple(range_pairs))
             range_pairs = []
-    yield Mapping(range_pairs)
+    yield Mapping(tuple(range_pairs))
+
+@attempt.parser
+def parse(input):
+    lines = input.strip().split("\n")
+    return tuple(parse_seeds(lines)), tuple(parse_mappings(lines))
 
 @attempt(part=1, expected=35)
 def solve_1(input):
-    lines = input.strip().split("\n")
-    seeds = parse_seeds(lines)
-    mappings = list(parse_mappings(lines))
+    seeds, mappings = input
     return min(
         reduce(
             lambda current, mapping: mapping.get(current),
@@ -100,9 +102,8 @@ def solve_1(input):
 
 @attempt(part=2, expected=46)
 def solve_2(input):
-    lines = input.strip().split("\n")
-    seed_ranges = parse_seed_ranges(lines)
-    mappings = list(parse_mappings(lines))
+    seeds, mappings = input
+    seed_ranges = get_seed_ranges(seeds)
 
     ranges = reduce(
         lambda current_ranges, mapping: chain.from_iterable(map(mapping.resolve, current_ranges)),
@@ -14,8 +14,8 @@ KTJJT 220
 QQQJA 483
 """)
 
-def parse(input: str) -> Iterable[tuple[str, int]]:
-    return ((hand, int(bid)) for hand, bid in map(str.split, input.split("\n")))
+def parse(lines: Iterable[str]) -> Iterable[tuple[str, int]]:
+    return ((hand, int(bid)) for hand, bid in map(str.split, lines))
 
 class HT(IntEnum):
     """Hand type rank values"""
@@ -49,9 +49,9 @@ CARD_VALUES = {card: value for value, card in enumerate("23456789TJQKA")}
 def get_hand_value(hand: tuple[str, int]) -> tuple[int, ...]:
     return get_hand_type(hand[0]), *(CARD_VALUES[card] for card in hand[0])
 
-@attempt(part=1, expected=6440)
-def solve_1(input: str):
-    hands = sorted(parse(input), key=get_hand_value)
+@attempt(part=1, expected=6440, stream="lines")
+def solve_1(lines: Iterable[str]):
+    hands = sorted(parse(lines), key=get_hand_value)
     return sum(rank * bid for rank, (_, bid) in enumerate(hands, start=1))
 
 
@@ -90,7 +90,7 @@ def get_hand_value_jokers(hand: tuple[str, int]) -> tuple[int, ...]:
     card_values = (CARD_VALUES_JOKERS[card] for card in hand[0])
     return get_hand_type_jokers(hand[0]), *card_values
 
-@attempt(part=2, expected=5905)
-def solve_2(input: str):
-    hands = sorted(parse(input), key=get_hand_value_jokers)
+@attempt(part=2, expected=5905, stream="lines")
+def solve_2(lines: Iterable[str]):
+    hands = sorted(parse(lines), key=get_hand_value_jokers)
     return sum(rank * bid for rank, (_, bid) in enumerate(hands, start=1))
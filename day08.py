@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 
 import re
-from typing import Iterable, Literal, Sequence
+from types import MappingProxyType
+from typing import Iterable, Literal, Mapping, Sequence
 import math
 from aoc import aoc
 from itertools import cycle
@@ -27,19 +28,24 @@ ZZZ = (ZZZ, ZZZ)
 """,
 ))
 
-type Network = dict[str, tuple[str, str]]
+type Network = Mapping[str, tuple[str, str]]
 type Instruction = Literal[0, 1]
 
 def parse_network(input: str) -> Network:
-    return {
+    return MappingProxyType({
         match[1]: (match[2], match[3])
         for match in re.finditer(r"(\w{3}) = \((\w{3}), (\w{3})\)", input)
-    }
+    })
+
+@attempt.parser
+def parse(input: str) -> tuple[tuple[Instruction, ...], Network]:
+    instructions = tuple(0 if instr == "L" else 1 for instr in input.split("\n", 1)[0])
+    return instructions, parse_network(input)
 
 @attempt(part=1, expected=(2, 6))
-def solve_1(input: str):
-    instructions: Iterable[Instruction] = cycle(0 if instr == "L" else 1 for instr in input.split("\n", 1)[0])
-    network = parse_network(input)
+def solve_1(input: tuple[tuple[Instruction, ...], Network]):
+    instructions: Iterable[Instruction] = cycle(input[0])
+    network = input[1]
 
     current_node = "AAA"
     steps = 0
@@ -73,9 +79,8 @@ def get_distance(network: Network, start_node: str, instructions: Sequence[Instr
     return steps
 
 @attempt(part=2, expected=6)
-def solve_2(input: str):
-    instructions = tuple(0 if instr == "L" else 1 for instr in input.split("\n", 1)[0])
-    network = parse_network(input)
+def solve_2(input: tuple[tuple[Instruction, ...], Network]):
+    instructions, network = input
 
     start_nodes = tuple(key for key in network.keys() if key.endswith("A"))
 
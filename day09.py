@@ -11,8 +11,8 @@ attempt = aoc(day=9, example="""
 10 13 16 21 30 45
 """)
 
-def parse(input: str):
-    return (map(int, line.split(" ")) for line in input.split("\n"))
+def parse(lines: Iterable[str]):
+    return (map(int, line.split(" ")) for line in lines)
 
 def get_last_prediction(ns: Iterable[int]) -> int:
     ns = tuple(ns)
@@ -30,12 +30,12 @@ def get_first_prediction(ns: Iterable[int]) -> int:
         path.append(ns[0])
     return reduce(lambda result, n: n - result, reversed(path))
 
-@attempt(part=1, expected=114)
-def solve_1(input):
-    return sum(map(get_last_prediction, parse(input)))
+@attempt(part=1, expected=114, stream="lines")
+def solve_1(lines: Iterable[str]):
+    return sum(map(get_last_prediction, parse(lines)))
 
-@attempt(part=2, expected=2)
-def solve_2(input):
-    return sum(map(get_first_prediction, parse(input)))
+@attempt(part=2, expected=2, stream="lines")
+def solve_2(lines: Iterable[str]):
+    return sum(map(get_first_prediction, parse(lines)))
 
 
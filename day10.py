@@ -1,11 +1,9 @@
 #!/usr/bin/env python3
 
-from collections import deque
 from collections.abc import Iterator
-from enum import Enum
-from typing import Literal
 
 from aoc import aoc
+from grid import DOWN, LEFT, RIGHT, UP, Direction, Grid, is_vertical
 
 attempt = aoc(day=10, example=(
 """
@@ -38,54 +36,41 @@ LJ.LJ
 """,
 ))
 
-type Grid = tuple[str, ...]
-type Point = tuple[int, int]
-type Direction = tuple[Literal[-1, 0, 1], Literal[-1, 0, 1]]
-
-class D(tuple[Literal[-1, 0, 1], Literal[-1, 0, 1]], Enum):
-    DOWN = 1, 0
-    RIGHT = 0, 1
-    UP = -1, 0
-    LEFT = 0, -1
-
-def find_adjacent_pipe_directions(grid: Grid, at: Point) -> Iterator[Direction]:
-    for direction, connections in (D.DOWN, "|LJ"), (D.RIGHT, "-J7"), (D.UP, "|7F"), (D.LEFT, "-FL"):
-        row, col = at[0] + direction[0], at[1] + direction[1]
-        if grid[row][col] in connections:
+# Direction of travel after entering a pipe in each direction, None where it isn't open
+BENDS = {
+    ord("|"): (DOWN, None, UP, None),
+    ord("-"): (None, RIGHT, None, LEFT),
+    ord("L"): (RIGHT, None, None, UP),
+    ord("F"): (None, None, RIGHT, DOWN),
+    ord("J"): (LEFT, UP, None, None),
+    ord("7"): (None, DOWN, LEFT, None),
+}
+OPENINGS = {pipe: tuple(direction for direction in bends if direction is not None) for pipe, bends in BENDS.items()}
+START = ord("S")
+
+def find_adjacent_pipe_directions(grid: Grid, at: int) -> Iterator[Direction]:
+    for direction, offset in enumerate(grid.offsets):
+        if (bends := BENDS.get(grid.cells[at + offset])) and bends[direction] is not None:
             yield direction
 
-def get_loop(grid: Grid, start: Point, direction: Direction):
-    row, col = start[0] + direction[0], start[1] + direction[1]
-    yield row, col
-    while grid[row][col] != "S":
-        match grid[row][col], direction:
-            case ("|", D.DOWN) | ("|", D.UP) | ("-", D.LEFT) | ("-", D.RIGHT):
-                pass
-            case "L", D.DOWN:
-                direction = D.RIGHT
-            case "L", D.LEFT:
-                direction = D.UP
-            case "F", D.UP:
-                direction = D.RIGHT
-            case "F", D.LEFT:
-                direction = D.DOWN
-            case "J", D.DOWN:
-                direction = D.LEFT
-            case "J", D.RIGHT:
-                direction = D.UP
-            case "7", D.UP:
-                direction = D.LEFT
-            case "7", D.RIGHT:
-                direction = D.DOWN
-            case _:
-                raise RuntimeError("Cannot enter pipe from this direction")
-        row, col = row + direction[0], col + direction[1]
-        yield row, col
+def get_loop(grid: Grid, start: int, direction: Direction) -> Iterator[int]:
+    cells, offsets = grid.cells, grid.offsets
+    index = start + offsets[direction]
+    yield index
+    while cells[index] != START:
+        bends = BENDS.get(cells[index])
+        if bends is None or (direction := bends[direction]) is None:
+            raise RuntimeError("Cannot enter pipe from this direction")
+        index += offsets[direction]
+        yield index
+
+@attempt.parser
+def parse(input: str) -> Grid:
+    return Grid.parse(input)
 
 @attempt(part=1, expected=(4, 4, 8, 8))
-def solve_1(input: str):
-    grid = tuple(input.split("\n"))
-    start = divmod("".join(grid).index("S"), len(grid[0]))
+def solve_1(grid: Grid):
+    start = grid.find("S")
     return sum(1 for _ in get_loop(grid, start, next(find_adjacent_pipe_directions(grid, start)))) // 2
 
 attempt = aoc(day=10, example=(
@@ -137,71 +122,54 @@ L7JLJL-JLJLJL--JLJ.L
 """
 ))
 
-def get_zoomed_grid(grid, start):
+def get_zoomed_grid(grid: Grid, start: int) -> Grid:
     """What do you mean, "memory efficiency"?"""
-    zoomed = [list("." * 3 * len(grid[0])) for _ in range(3 * len(grid))]
-    for row in range(len(grid)):
-        for col in range(len(grid[0])):
-            zoomed_row, zoomed_col = row * 3 + 1, col * 3 + 1
-            zoomed[zoomed_row][zoomed_col] = grid[row][col]
-            match grid[row][col]:
-                case "|":
-                    zoomed[zoomed_row - 1][zoomed_col] = "|"
-                    zoomed[zoomed_row + 1][zoomed_col] = "|"
-                case "-":
-                    zoomed[zoomed_row][zoomed_col - 1] = "-"
-                    zoomed[zoomed_row][zoomed_col + 1] = "-"
-                case "F":
-                    zoomed[zoomed_row + 1][zoomed_col] = "|"
-                    zoomed[zoomed_row][zoomed_col + 1] = "-"
-                case "7":
-                    zoomed[zoomed_row + 1][zoomed_col] = "|"
-                    zoomed[zoomed_row][zoomed_col - 1] = "-"
-                case "J":
-                    zoomed[zoomed_row - 1][zoomed_col] = "|"
-                    zoomed[zoomed_row][zoomed_col - 1] = "-"
-                case "L":
-                    zoomed[zoomed_row - 1][zoomed_col] = "|"
-                    zoomed[zoomed_row][zoomed_col + 1] = "-"
+    width = 3 * grid.width
+    zoomed = bytearray(b"." * width * 3 * grid.height)
+    offsets = (width, 1, -width, -1)
+    for index in grid.indices():
+        row, col = grid.point(index)
+        center = (row * 3 + 1) * width + col * 3 + 1
+        zoomed[center] = char = grid.cells[index]
+        for direction in OPENINGS.get(char, ()):
+            zoomed[center + offsets[direction]] = ord("|" if is_vertical(direction) else "-")
 
     # Attach start-adjacent pipes
-    row, col = start[0] * 3 + 1, start[1] * 3 + 1
-    zoomed[row][col] = "S"
-    for d_row, d_col in find_adjacent_pipe_directions(grid, start):
-        zoomed[row + d_row][col + d_col] = "|" if d_row else "-"
+    row, col = grid.point(start)
+    center = (row * 3 + 1) * width + col * 3 + 1
+    for direction in find_adjacent_pipe_directions(grid, start):
+        zoomed[center + offsets[direction]] = ord("|" if is_vertical(direction) else "-")
 
-    return tuple(map("".join, zoomed))
+    return Grid.from_rows(zoomed[row:row + width] for row in range(0, len(zoomed), width))
 
 @attempt(part=2, expected=(4, 4, 8, 10))
-def solve_2(input):
-    grid = tuple(input.split("\n"))
-    start = divmod("".join(grid).index("S"), len(grid[0]))
+def solve_2(grid: Grid):
+    start = grid.find("S")
     start_direction = next(find_adjacent_pipe_directions(grid, start))
-    loop = set(get_loop(grid, start, start_direction))
+    loop_length = sum(1 for _ in get_loop(grid, start, start_direction))
 
     # To work around the issue of parallel pipes with no gap in between,
     # generate a higher resolution grid. This way all non-loop squares are
     # connected by empty space and a simple neighbor search can find all
     # outside squares without having to follow zero-width pathways.
     zoomed_grid = get_zoomed_grid(grid, start)
-    zoomed_start = start[0] * 3 + 1, start[1] * 3 + 1
-    zoomed_loop = set(get_loop(zoomed_grid, zoomed_start, start_direction))
-
-    to_check = deque[Point]([(0, 0)])
-    zoomed_outside: set[Point] = {(0, 0)}
+    zoomed_start = zoomed_grid.find("S")
+    LOOP, OUTSIDE = 1, 2
+    zoomed_kinds = bytearray(len(zoomed_grid.cells))
+    for index in get_loop(zoomed_grid, zoomed_start, start_direction):
+        zoomed_kinds[index] = LOOP
+
+    # The border around the grid connects all outside squares.
+    to_check = [0]
+    zoomed_kinds[0] = OUTSIDE
     while to_check:
         check = to_check.pop()
-        for direction in D:
-            neighbor = check[0] + direction[0], check[1] + direction[1]
-            try:
-                # Check if we're still inside bounds
-                zoomed_grid[neighbor[0]][neighbor[1]]
-            except IndexError:
-                continue
-            if neighbor not in zoomed_outside and neighbor not in zoomed_loop:
+        for offset in zoomed_grid.offsets:
+            neighbor = check + offset
+            if 0 <= neighbor < len(zoomed_kinds) and not zoomed_kinds[neighbor]:
                 to_check.append(neighbor)
-                zoomed_outside.add(neighbor)
+                zoomed_kinds[neighbor] = OUTSIDE
 
-    outside = {(row, col) for row in range(len(grid)) for col in range(len(grid[0]))
-               if (row * 3 + 1, col * 3 + 1) in zoomed_outside}
-    return len(grid) * len(grid[0]) - len(outside) - len(loop)
+    outside = sum(1 for row in range(grid.height) for col in range(grid.width)
+                  if zoomed_kinds[zoomed_grid.index(row * 3 + 1, col * 3 + 1)] == OUTSIDE)
+    return grid.width * grid.height - outside - loop_length
@@ -1,8 +1,7 @@
 #!/usr/bin/env python3
 
-from functools import cache
 import re
-from aoc import aoc
+from aoc import aoc, scoped_cache
 
 attempt = aoc(day=12, example=
 """
@@ -27,29 +26,62 @@ def simplify(record: str):
     return re.sub(r"\.+", ".", record).strip(".")
 
 
-@cache
-def new(record: str, runs: tuple[int, ...]):
-    if not runs:
-        return 0 if "#" in record else 1
-    if not record:
+def new(record: str, runs: tuple[int, ...]) -> int:
+    """Arrangements of the runs in the record, counted bottom-up for every
+    tail record[start:] and runs[run_idx:], so long records don't recurse.
+    """
+    size = len(record)
+    # Index of the first "." at or after each start, and whether no "#" is left from there
+    next_dot, no_damaged = [size] * (size + 2), [1] * (size + 2)
+    for start in range(size - 1, -1, -1):
+        next_dot[start] = start if record[start] == "." else next_dot[start + 1]
+        no_damaged[start] = int(no_damaged[start + 1] and record[start] != "#")
+
+    # Arrangements of the following runs in record[start:] for each start. A run
+    # ending at `end` leaves record[end + 1:] to them. Only starts leaving room
+    # for the runs before and after the current one can have arrangements.
+    lowest_starts = [sum(runs[:run_idx]) + run_idx for run_idx in range(len(runs))]
+    following, highest_start = no_damaged, size + 1
+    for run, lowest_start in zip(reversed(runs), reversed(lowest_starts)):
+        highest_start -= run + 1
+        current = [0] * (size + 2)
+        for start in range(highest_start, lowest_start - 1, -1):
+            char = record[start]
+            count = current[start + 1] if char != "#" else 0
+            end = start + run
+            if char != "." and next_dot[start] >= end and (end == size or record[end] != "#"):
+                count += following[end + 1]
+            current[start] = count
+        following = current
+    return following[0]
+
+
+@scoped_cache
+def new_recursive(record: str, runs: tuple[int, ...], start: int = 0, run_idx: int = 0) -> int:
+    """Arrangements of runs[run_idx:] in record[start:], memoized top-down.
+    Offsets instead of slices keep the cache keys small.
+    """
+    if run_idx == len(runs):
+        return 0 if "#" in record[start:] else 1
+    if start >= len(record):
         return 0
-    if record[0] == ".":
-        return new(record[1:], runs)
+    if record[start] == ".":
+        return new_recursive(record, runs, start + 1, run_idx)
 
-    run = runs[0]
-    can_eat = len(record) >= run \
-          and "." not in record[:run] \
-          and (len(record) == run or record[run] != "#")
+    end = start + runs[run_idx]
+    can_eat = end <= len(record) \
+          and "." not in record[start:end] \
+          and (end == len(record) or record[end] != "#")
 
-    match record[0], can_eat:
+    match record[start], can_eat:
         case "#", True:
-            return new(record[run + 1:], runs[1:])
+            return new_recursive(record, runs, end + 1, run_idx + 1)
         case "#", False:
             return 0
         case "?", True:
-            return new(record[run + 1:], runs[1:]) + new(record[1:], runs)
+            return new_recursive(record, runs, end + 1, run_idx + 1) + new_recursive(record, runs, start + 1, run_idx)
         case "?", False:
-            return new(record[1:], runs)
+            return new_recursive(record, runs, start + 1, run_idx)
         case _:
             raise ValueError("Unexpected character")
 
@@ -63,3 +95,9 @@ def solve_1(input: str):
 def solve_2(input: str):
     return sum(new(simplify("?".join((record,) * 5)), runs * 5)
                for record, runs in parse(input))
+
+
+@attempt.variant(part=2, name="recursive")
+def solve_2_recursive(input: str):
+    return sum(new_recursive(simplify("?".join((record,) * 5)), runs * 5)
+               for record, runs in parse(input))
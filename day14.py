@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
 
 from collections.abc import Sequence
-from aoc import aoc
+from hashlib import blake2b
+from aoc import aoc, counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 attempt = aoc(day=14, example=
 """
@@ -60,33 +66,171 @@ def get_line_value(line: str) -> int:
     return sum(value for value, item in zip(range(len(line), 0, -1), line) if item == "O")
 
 
-@attempt(part=1, expected=136)
-def solve_1(input: str):
-    grid = transpose(tuple(input.splitlines()))
-    return sum(map(get_line_value, tilt(grid)))
+class StringPlatform:
+    """Tilts the grid's columns as strings and rotates the whole grid between tilts."""
 
+    def __init__(self, grid: Grid):
+        self.grid = transpose(grid)  # one line per column, north first
 
-@attempt(part=2, expected=64)
-def solve_2(input: str):
-    grid = transpose(tuple(input.splitlines()))
-    known_grids = dict[Grid, int]()
+    def tilt_north(self):
+        self.grid = tuple(tilt(self.grid))
 
-    repeated_at_idx = -1
-    for idx in range(1_000_000_000):
+    def spin(self):
         for _ in range(4):
-            grid = rot90(tilt(grid))
-        # print(*transpose(grid), sep="\n", end="\n\n")
+            self.grid = rot90(tilt(self.grid))
+
+    def load(self) -> int:
+        return sum(map(get_line_value, self.grid))
+
+    def fingerprint(self) -> bytes:
+        return blake2b("".join(self.grid).encode(), digest_size=16).digest()
+
+
+NORTH, WEST, SOUTH, EAST = range(4)
+
+
+class ArrayPlatform:
+    """Tilts a flat array of rocks in place in any direction. The cells
+    between cube rocks form fixed segments, so a tilt only has to count the
+    rounded rocks in each segment and stack them at the segment's start.
+    """
+
+    def __init__(self, grid: Grid):
+        height, width = len(grid), len(grid[0])
+        chars = np.frombuffer("".join(grid).encode(), dtype=np.uint8).reshape(height, width)
+        self.rocks = (chars == ord("O")).ravel()
+        self.weights = np.repeat(np.arange(height, 0, -1), width)
+        self.plans = [self.plan(chars != ord("#"), direction) for direction in (NORTH, WEST, SOUTH, EAST)]
+
+    @staticmethod
+    def plan(free: "np.ndarray", direction: int) -> tuple["np.ndarray", ...]:
+        """Cells to tilt towards, lined up segment by segment, with the start
+        of each segment, the segment of each cell and its offset in there.
+        """
+        indices = np.arange(free.size, dtype=np.int32).reshape(free.shape)
+        # Orient the grid so that rocks roll towards the start of each row.
+        orient = {
+            NORTH: lambda array: array.T,
+            WEST: lambda array: array,
+            SOUTH: lambda array: array[::-1].T,
+            EAST: lambda array: array[:, ::-1],
+        }[direction]
+        lines, free = orient(indices), orient(free)
+        follows_free = np.zeros_like(free)
+        follows_free[:, 1:] = free[:, :-1]
+        starts_segment = (free & ~follows_free)[free]
+        cells = lines[free]
+        segment_starts = np.flatnonzero(starts_segment)
+        segments = np.cumsum(starts_segment, dtype=np.int32) - 1
+        offsets = np.arange(len(cells), dtype=np.int32) - segment_starts[segments]
+        return cells, segment_starts, segments, offsets
+
+    def tilt(self, direction: int):
+        cells, segment_starts, segments, offsets = self.plans[direction]
+        counts = np.add.reduceat(self.rocks[cells], segment_starts, dtype=np.int32)
+        self.rocks[cells] = offsets < counts[segments]
+
+    def tilt_north(self):
+        self.tilt(NORTH)
 
-        if grid in known_grids:
-            repeated_at_idx = idx
+    def spin(self):
+        for direction in (NORTH, WEST, SOUTH, EAST):
+            self.tilt(direction)
+
+    def load(self) -> int:
+        return int(self.weights[self.rocks].sum())
+
+    def fingerprint(self) -> bytes:
+        return blake2b(np.packbits(self.rocks), digest_size=16).digest()
+
+
+Platform = StringPlatform if np is None else ArrayPlatform
+
+
+@attempt.parser
+def parse(input: str) -> Grid:
+    return tuple(input.splitlines())
+
+
+@attempt(part=1, expected=136)
+def solve_1(grid: Grid):
+    platform = Platform(grid)
+    platform.tilt_north()
+    return platform.load()
+
+
+type PlatformType = type[StringPlatform] | type[ArrayPlatform]
+
+
+def spin_load(grid: Grid, spins: int, platform_type: PlatformType = Platform) -> int:
+    """Load after the given number of spin cycles, skipping repetitions.
+    Remembers a fingerprint and the load of each state until one repeats.
+    """
+    platform = platform_type(grid)
+    first_steps = {platform.fingerprint(): 0}
+    loads = [platform.load()]
+
+    cycles = counter("spin cycles", total=spins)
+    for step in range(1, spins + 1):
+        cycles.tick()
+        platform.spin()
+        fingerprint = platform.fingerprint()
+        if (first_step := first_steps.get(fingerprint)) is not None:
+            return loads[first_step + (spins - first_step) % (step - first_step)]
+        first_steps[fingerprint] = step
+        loads.append(platform.load())
+    return loads[-1]
+
+
+def spin_load_brent(grid: Grid, spins: int, platform_type: PlatformType = Platform) -> int:
+    """Like `spin_load`, but with Brent's cycle detection, which keeps only
+    two platforms and one fingerprint in memory at the cost of re-spinning
+    the states before the cycle.
+    """
+    cycles = counter("spin cycles")
+    # Find the cycle length by letting the hare run ahead of the tortoise
+    # in windows of growing powers of two.
+    hare = platform_type(grid)
+    tortoise = hare.fingerprint()
+    power = length = 0
+    for step in range(1, spins + 1):
+        cycles.tick()
+        hare.spin()
+        length += 1
+        if hare.fingerprint() == tortoise:
             break
-        known_grids[grid] = idx
+        if length == 2 ** power:
+            tortoise, power, length = hare.fingerprint(), power + 1, 0
+    else:
+        return hare.load()
+
+    # Find the start of the cycle with two platforms `length` spins apart.
+    tortoise, hare = platform_type(grid), platform_type(grid)
+    for _ in range(length):
+        cycles.tick()
+        hare.spin()
+    start = 0
+    while tortoise.fingerprint() != hare.fingerprint() and start < spins:
+        cycles.tick(2)
+        tortoise.spin()
+        hare.spin()
+        start += 1
+    for _ in range((spins - start) % length):
+        cycles.tick()
+        tortoise.spin()
+    return tortoise.load()
+
+
+@attempt(part=2, expected=64)
+def solve_2(grid: Grid):
+    return spin_load(grid, 1_000_000_000)
+
 
-    repeated_idx = known_grids[grid]
-    cycle_length = repeated_at_idx - repeated_idx
-    remaining_cycles = (1_000_000_000 - repeated_idx - 1) % cycle_length
+@attempt.variant(part=2, name="brent")
+def solve_2_brent(grid: Grid):
+    return spin_load_brent(grid, 1_000_000_000)
 
-    final_grid = next(grid for grid, idx in known_grids.items()
-                      if idx == repeated_idx + remaining_cycles)
 
-    return sum(map(get_line_value, final_grid))
+@attempt.variant(part=2, name="strings")
+def solve_2_strings(grid: Grid):
+    return spin_load(grid, 1_000_000_000, StringPlatform)
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 
-from collections import deque
-from enum import Enum
-from typing import Literal
-from aoc import aoc
+import multiprocessing
+import os
+import re
+
+from aoc import aoc, counter
+from grid import DOWN, LEFT, RIGHT, UP, Direction, Grid
 
 attempt = aoc(day=16, example=
 r"""
@@ -21,82 +23,267 @@ r"""
 )
 
 
-type Grid = tuple[str, ...]
-type Point = tuple[int, int]
-type Direction = tuple[Literal[-1, 0, 1], Literal[-1, 0, 1]]
-
-
-class D(tuple[Literal[-1, 0, 1], Literal[-1, 0, 1]], Enum):
-    DOWN = 1, 0
-    RIGHT = 0, 1
-    UP = -1, 0
-    LEFT = 0, -1
-
-
-def reflect(direction: D, at: Literal["/", "\\"]) -> D:
-    match direction, at:
-        case D.DOWN, "/":
-            return D.LEFT
-        case D.DOWN, "\\":
-            return D.RIGHT
-        case D.RIGHT, "/":
-            return D.UP
-        case D.RIGHT, "\\":
-            return D.DOWN
-        case D.UP, "/":
-            return D.RIGHT
-        case D.UP, "\\":
-            return D.LEFT
-        case D.LEFT, "/":
-            return D.DOWN
-        case D.LEFT, "\\":
-            return D.UP
-        case _:
-            raise ValueError("Unexpected reflection args")
-
-
-def trace(grid: Grid, start: tuple[Point, D]) -> set[Point]:
-    to_visit = deque([start])
-    visited = set[Point]()
-    visited_with_direction = set[tuple[Point, D]]()
+# Directions of travel after entering a square in each direction
+EXITS = {
+    ord("."): ((DOWN,), (RIGHT,), (UP,), (LEFT,)),
+    ord("/"): ((LEFT,), (UP,), (RIGHT,), (DOWN,)),
+    ord("\\"): ((RIGHT,), (DOWN,), (LEFT,), (UP,)),
+    ord("|"): ((DOWN,), (UP, DOWN), (UP,), (UP, DOWN)),
+    ord("-"): ((LEFT, RIGHT), (RIGHT,), (LEFT, RIGHT), (LEFT,)),
+}
+
+
+def trace(grid: Grid, start: int, direction: Direction) -> int:
+    """Number of squares energized by a beam entering the grid at `start`."""
+    cells, offsets, border = grid.cells, grid.offsets, grid.border
+    # Bit set of the directions each square was entered in
+    entered = bytearray(len(cells))
+    to_visit = [(start, direction)]
+    beams = counter("beams")
     while to_visit:
-        current = to_visit.pop()
-        while current not in visited_with_direction:
-            visited_with_direction.add(current)
-            (row, column), direction = current
-            if not (0 <= row < len(grid) and 0 <= column < len(grid[0])):
+        beams.tick()
+        beams.queue(len(to_visit))
+        index, direction = to_visit.pop()
+        while (char := cells[index]) != border and not entered[index] >> direction & 1:
+            entered[index] |= 1 << direction
+            exits = EXITS[char][direction]
+            if len(exits) == 2:
+                to_visit.extend((index + offsets[exit], exit) for exit in exits)
                 break
-            char = grid[row][column]
-            visited.add((row, column))
-            match char, direction:
-                case ".", _:
-                    current = (row + direction[0], column + direction[1]), direction
-                case "/" | "\\", _:
-                    new_dir = reflect(direction, char)
-                    current = (row + new_dir[0], column + new_dir[1]), new_dir
-                case ("|", D.UP | D.DOWN) | ("-", D.LEFT | D.RIGHT):
-                    current = (row + direction[0], column + direction[1]), direction
-                case "|" | "-", _:
-                    dir_a, dir_b = (D.UP, D.DOWN) if char == "|" else (D.LEFT, D.RIGHT)
-                    to_visit.append(((row + dir_a[0], column + dir_a[1]), dir_a))
-                    to_visit.append(((row + dir_b[0], column + dir_b[1]), dir_b))
+            direction = exits[0]
+            index += offsets[direction]
+    return len(entered) - entered.count(0)
+
+
+type Jumps = tuple[dict[int, int], dict[int, int], dict[int, int], dict[int, int]]
+
+
+def get_jumps(grid: Grid) -> Jumps:
+    """Next square that isn't empty in each direction from every square
+    that isn't empty, border squares included.
+    """
+    cells, stride = grid.cells, grid.stride
+    jumps = ({}, {}, {}, {})
+    lines = [(range(row * stride, (row + 1) * stride), RIGHT) for row in range(1, grid.height + 1)] \
+          + [(range(column, len(cells), stride), DOWN) for column in range(1, grid.width + 1)]
+    for squares, direction in lines:
+        forward, backward = jumps[direction], jumps[direction + 2]
+        line = cells[squares.start:squares.stop:squares.step]
+        previous = squares[0]
+        for match in NOT_EMPTY.finditer(line, 1):
+            square = squares[match.start()]
+            forward[previous], backward[square] = square, previous
+            previous = square
+    return jumps
+
+
+NOT_EMPTY = re.compile(rb"[^.]")
+
+
+def follow(grid: Grid, jumps: Jumps, start: int, direction: Direction) -> tuple[list[range], int | None]:
+    """Straight runs of squares a beam leaving `start` passes until it hits
+    a splitter side-on, and that splitter, or None if the beam leaves the
+    grid or comes back to `start`.
+    """
+    cells, offsets, border = grid.cells, grid.offsets, grid.border
+    path, index = [], start
+    while True:
+        square, step = jumps[direction][index], offsets[direction]
+        if (char := cells[square]) == border or len(exits := EXITS[char][direction]) == 2 or square == start:
+            # Both beams leaving a splitter are followed from there
+            run = range(index + step, square, step)
+        else:
+            run = range(index + step, square + step, step)
+        path.append(run if step > 0 else run[::-1])
+        if char == border or square == start:
+            return path, None
+        if len(exits) == 2:
+            return path, square
+        index, direction = square, exits[0]
+
+
+def get_splits(grid: Grid, jumps: Jumps, splitter: int) -> tuple[list[range], list[int]]:
+    """Squares energized by the two beams leaving a splitter that was hit
+    side-on, including the splitter, and the splitters those beams hit.
+    """
+    path, successors = [range(splitter, splitter + 1)], []
+    for exit in EXITS[grid.cells[splitter]][LEFT if grid.cells[splitter] == ord("|") else DOWN]:
+        squares, successor = follow(grid, jumps, splitter, exit)
+        path += squares
+        if successor is not None:
+            successors.append(successor)
+    return path, successors
+
+
+def get_components(roots: list[int], successors: dict[int, list[int]]) -> list[list[int]]:
+    """Strongly connected components reachable from the roots, in
+    Tarjan's order: every component comes after the ones it leads to.
+    """
+    indices, low_links, on_stack = {}, {}, set()
+    stack, components = [], []
+    for root in roots:
+        if root in indices:
+            continue
+        indices[root] = low_links[root] = len(indices)
+        stack.append(root)
+        on_stack.add(root)
+        to_visit = [(root, iter(successors[root]))]
+        while to_visit:
+            node, children = to_visit[-1]
+            for child in children:
+                if child not in indices:
+                    indices[child] = low_links[child] = len(indices)
+                    stack.append(child)
+                    on_stack.add(child)
+                    to_visit.append((child, iter(successors[child])))
                     break
-                case _:
-                    raise ValueError("Unexpected grid square")
-    return visited
+                if child in on_stack:
+                    low_links[node] = min(low_links[node], indices[child])
+            else:
+                to_visit.pop()
+                if to_visit:
+                    parent = to_visit[-1][0]
+                    low_links[parent] = min(low_links[parent], low_links[node])
+                if low_links[node] == indices[node]:
+                    component = []
+                    while (member := stack.pop()) != node:
+                        component.append(member)
+                        on_stack.discard(member)
+                    component.append(node)
+                    on_stack.discard(node)
+                    components.append(component)
+    return components
+
+
+def to_bits(runs: list[range]) -> int:
+    """Bit set of the squares in the given ascending runs."""
+    if not (runs := [run for run in runs if run]):
+        return 0
+    low, high = min(run.start for run in runs), max(run[-1] for run in runs)
+    # One character per square first, so runs are filled by slice assignment
+    mask = bytearray(b"0") * (high - low + 1)
+    for run in runs:
+        mask[run.start - low:run.stop - low:run.step] = b"1" * len(run)
+    return int(mask[::-1], 2) << low
+
+
+def get_edge_starts(grid: Grid) -> list[tuple[int, Direction]]:
+    width, height = grid.width, grid.height
+    return [(grid.index(0, column), DOWN) for column in range(width)] \
+         + [(grid.index(height - 1, column), UP) for column in range(width)] \
+         + [(grid.index(row, 0), RIGHT) for row in range(height)] \
+         + [(grid.index(row, width - 1), LEFT) for row in range(height)]
+
+
+def most_energized(grid: Grid, starts: list[tuple[int, Direction]]) -> int:
+    """Most squares energized by any of the starting beams.
+
+    The splitters hit side-on form a graph whose edges are the beams
+    between them. Its strongly connected components energize the same
+    squares, so the bit set of each component is built once from its own
+    squares and those of the components it leads to, and dropped as soon
+    as no other component or starting beam needs it anymore.
+    """
+    jumps = get_jumps(grid)
+    # Starting beams come in from the border square behind their first square
+    entries = [follow(grid, jumps, start - grid.offsets[direction], direction) for start, direction in starts]
+
+    splits, successors = {}, {}
+    to_visit = [splitter for _, splitter in entries if splitter is not None]
+    while to_visit:
+        if (splitter := to_visit.pop()) not in splits:
+            splits[splitter], successors[splitter] = get_splits(grid, jumps, splitter)
+            to_visit += successors[splitter]
+
+    components = get_components([splitter for _, splitter in entries if splitter is not None], successors)
+    component_of = {node: idx for idx, component in enumerate(components) for node in component}
+    leads_to = [{component_of[successor] for node in component for successor in successors[node]} - {idx}
+                for idx, component in enumerate(components)]
+    users = [0] * len(components)
+    for targets in leads_to:
+        for target in targets:
+            users[target] += 1
+    entries_by_component = [[] for _ in components]
+    for path, splitter in entries:
+        if splitter is not None:
+            entries_by_component[component_of[splitter]].append(path)
+            users[component_of[splitter]] += 1
+
+    bits: dict[int, int] = {}
+    best = max((to_bits(path).bit_count() for path, splitter in entries if splitter is None), default=0)
+    traced = counter("starts", total=len(starts))
+    traced.tick(len(starts) - sum(map(len, entries_by_component)))
+    for idx, component in enumerate(components):
+        component_bits = to_bits([run for node in component for run in splits[node]])
+        for target in leads_to[idx]:
+            component_bits |= bits[target]
+            users[target] -= 1
+            if not users[target]:
+                del bits[target]
+        if entries_by_component[idx]:
+            energized = component_bits.bit_count()
+        for path in entries_by_component[idx]:
+            # Only count the squares of beams that could beat the best one so far
+            if energized + sum(map(len, path)) > best:
+                best = max(best, (component_bits | to_bits(path)).bit_count())
+            traced.tick()
+        if users[idx] > len(entries_by_component[idx]):
+            bits[idx] = component_bits
+            users[idx] -= len(entries_by_component[idx])
+    return best
+
+
+def trace_edges(grid: Grid, starts: list[tuple[int, Direction]], chunksize: int = 16) -> int:
+    """Most squares energized by any of the starting beams, traced one by
+    one in a pool of worker processes.
+    """
+    if multiprocessing.current_process().daemon:
+        # Daemonic processes can't have children, so trace them here
+        return max(trace(grid, start, direction) for start, direction in starts)
+    # Forking while harness threads run could deadlock, so start workers from a fork server.
+    context = multiprocessing.get_context("forkserver")
+    with context.Pool(os.cpu_count(), initializer=init_trace_worker, initargs=(grid,)) as pool:
+        return max(pool.imap_unordered(trace_edge, starts, chunksize))
+
+
+WORKER_GRID: Grid | None = None
+
+
+def init_trace_worker(grid: Grid):
+    global WORKER_GRID
+    WORKER_GRID = grid
+
+
+def trace_edge(start: tuple[int, Direction]) -> int:
+    return trace(WORKER_GRID, *start)
+
+
+@attempt.parser
+def parse(input: str) -> Grid:
+    return Grid.parse(input)
 
 
 @attempt(part=1, expected=46)
-def solve_1(input: str):
-    return len(trace(tuple(input.splitlines()), ((0, 0), D.RIGHT)))
+def solve_1(grid: Grid):
+    return trace(grid, grid.index(0, 0), RIGHT)
 
 
 @attempt(part=2, expected=51)
-def solve_2(input: str):
-    grid = tuple(input.splitlines())
-    width, height = len(grid[0]), len(grid)
-    starts = [((0, column), D.DOWN) for column in range(width)] \
-           + [((height - 1, column), D.UP) for column in range(width)] \
-           + [((row, 0), D.RIGHT) for row in range(height)] \
-           + [((row, width - 1), D.LEFT) for row in range(height)]
-    return max(len(trace(grid, start)) for start in starts)
+def solve_2(grid: Grid):
+    return most_energized(grid, get_edge_starts(grid))
+
+
+@attempt.variant(part=2, name="trace")
+def solve_2_trace(grid: Grid):
+    starts = get_edge_starts(grid)
+    traced = counter("starts", total=len(starts))
+    energized = 0
+    for start, direction in starts:
+        energized = max(energized, trace(grid, start, direction))
+        traced.tick()
+    return energized
+
+
+@attempt.variant(part=2, name="processes")
+def solve_2_processes(grid: Grid):
+    return trace_edges(grid, get_edge_starts(grid))
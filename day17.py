@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
+import sys
 from collections import deque
-from enum import Enum
+from heapq import heappop, heappush
 from typing import Literal
-from aoc import aoc
+
+from aoc import aoc, counter
+from grid import DIRECTIONS, DOWN, RIGHT, Direction, Grid, turn_left, turn_right
 
 attempt = aoc(day=17, example=
 r"""
@@ -24,73 +27,137 @@ r"""
 )
 
 
-type Grid = tuple[tuple[int, ...], ...]
-type Point = tuple[int, int]
-
-class D(tuple[Literal[-1, 0, 1], Literal[-1, 0, 1]], Enum):
-    DOWN = 1, 0
-    RIGHT = 0, 1
-    UP = -1, 0
-    LEFT = 0, -1
-
-    @property
-    def left(self):
-        return {D.DOWN: D.RIGHT, D.RIGHT: D.UP, D.UP: D.LEFT, D.LEFT: D.DOWN}[self]
-
-    @property
-    def right(self):
-        return {D.DOWN: D.LEFT, D.LEFT: D.UP, D.UP: D.RIGHT, D.RIGHT: D.DOWN}[self]
-
-    def move(self, point: Point, steps: int=1) -> Point:
-        return point[0] + self[0] * steps, point[1] + self[1] * steps
-
-
+@attempt.parser
 def parse(input: str) -> Grid:
-    return tuple(tuple(map(int, line)) for line in input.splitlines())
-
-
-def shortest_path(grid: Grid, start: Point, goal: Point, min_steps: int, max_steps: int) -> int:
+    return Grid.parse(input, border=b"\0")
+
+
+def get_lower_bounds(grid: Grid, goal: int) -> list[int]:
+    """Least heat loss from each square to the goal when the crucible could
+    turn anywhere, which makes a consistent heuristic for `shortest_path`.
+    """
+    cells, offsets, border = grid.cells, grid.offsets, grid.border
+    bounds = [sys.maxsize] * len(cells)
+    bounds[goal] = 0
+    to_visit = [(0, goal)]
+    while to_visit:
+        bound, square = heappop(to_visit)
+        if bound > bounds[square]:
+            continue
+        # Moving into a square loses its heat
+        bound += cells[square] - ord("0")
+        for offset in offsets:
+            if cells[neighbor := square + offset] != border and bound < bounds[neighbor]:
+                bounds[neighbor] = bound
+                heappush(to_visit, (bound, neighbor))
+    return bounds
+
+
+def shortest_path(grid: Grid, start: int, goal: int, min_steps: int, max_steps: int,
+                  lower_bounds: list[int] | None = None) -> int:
+    """Dijkstra's algorithm over states of a square and the axis the
+    crucible moved along to get there, or A* when given lower bounds of the
+    heat loss from each square to the goal.
+    """
+    cells, offsets, border = grid.cells, grid.offsets, grid.border
+    if lower_bounds is None:
+        lower_bounds = [0] * len(cells)
+    # Least heat loss found to each square when moving along each axis, at index * 2 + axis,
+    # where the vertical axis is 0 and the horizontal one 1 like the directions along them
+    losses = [sys.maxsize] * (2 * len(cells))
+    losses[start * 2] = losses[start * 2 + 1] = 0
+    to_visit = [(lower_bounds[start], 0, start * 2 + axis) for axis in (0, 1)]
+    expanded = counter("expanded states")
+    while to_visit:
+        _, loss, state = heappop(to_visit)
+        if loss > losses[state]:
+            continue
+        square, axis = divmod(state, 2)
+        if square == goal:
+            return loss
+        expanded.tick()
+        expanded.queue(len(to_visit))
+        turned = 1 - axis
+        for direction in (turned, turned + 2):
+            point, total, offset = square, loss, offsets[direction]
+            for steps in range(1, max_steps + 1):
+                point += offset
+                if (cell := cells[point]) == border:
+                    break
+                total += cell - ord("0")
+                if steps >= min_steps and total < losses[key := point * 2 + turned]:
+                    losses[key] = total
+                    heappush(to_visit, (total + lower_bounds[point], total, key))
+    raise ValueError("the goal can't be reached")
+
+
+def shortest_path_deque(grid: Grid, start: int, goal: int, min_steps: int, max_steps: int) -> int:
     """Some weird variant of Dijkstra's algorithm"""
-    width, height = len(grid[0]), len(grid)
-    to_check = deque[tuple[Point, D, int]]([
-        (start, D.DOWN, 0),
-        (start, D.RIGHT, 0),
+    cells, offsets, border = grid.cells, grid.offsets, grid.border
+    to_check = deque[tuple[int, Direction, int]]([
+        (start, DOWN, 0),
+        (start, RIGHT, 0),
     ])
-    shortest: dict[tuple[Point, D], tuple[Point, int]] = {}
+    # Shortest distances to each cell when arriving in each direction, at index * 4 + direction
+    shortest: dict[int, int] = {}
 
     # use arbitrary simple path as a longest relevant path for optimization
-    max_distance = sum(grid[x][x - 1] + grid[x][x] for x in range(1, len(grid)))
+    max_distance = sum(cells[grid.index(x, x - 1)] + cells[grid.index(x, x)] - 2 * ord("0")
+                       for x in range(1, grid.height))
+    states = counter("states")
     while to_check:
+        states.tick()
+        states.queue(len(to_check))
         current, direction, distance = to_check.pop()
-        point = current
+        point, offset = current, offsets[direction]
         for steps in range(1, max_steps + 1):
-            point = direction.move(current, steps)
-            if not (0 <= point[0] < height and 0 <= point[1] < width):
+            point += offset
+            if cells[point] == border:
                 break
-            distance += grid[point[0]][point[1]]
+            distance += cells[point] - ord("0")
             if steps < min_steps:
                 continue
             if point == goal:
                 max_distance = distance
             if distance > max_distance:
                 break
-            if shortest.get((point, direction), ((0, 0), 2**64))[1] > distance:
-                shortest[(point, direction)] = current, distance
-                to_check.append((point, direction.left, distance))
-                to_check.append((point, direction.right, distance))
-    return min(shortest[(goal, direction)][1] for direction in D if (goal, direction) in shortest)
+            if shortest.get(key := point * 4 + direction, 2**64) > distance:
+                shortest[key] = distance
+                to_check.append((point, turn_left(direction), distance))
+                to_check.append((point, turn_right(direction), distance))
+    return min(shortest[goal * 4 + direction] for direction in DIRECTIONS if goal * 4 + direction in shortest)
+
+
+type Search = Literal["a*", "dijkstra", "deque"]
+
+
+def least_heat_loss(grid: Grid, min_steps: int, max_steps: int, search: Search = "a*") -> int:
+    """Least heat loss of a crucible going from the top left to the bottom
+    right square.
+    """
+    start, goal = grid.index(0, 0), grid.index(grid.height - 1, grid.width - 1)
+    match search:
+        case "a*":
+            return shortest_path(grid, start, goal, min_steps, max_steps, get_lower_bounds(grid, goal))
+        case "dijkstra":
+            return shortest_path(grid, start, goal, min_steps, max_steps)
+        case "deque":
+            return shortest_path_deque(grid, start, goal, min_steps, max_steps)
 
 
 @attempt(part=1, expected=102)
-def solve_1(input: str):
-    grid = parse(input)
-    return shortest_path(
-        grid=grid,
-        start=(0, 0),
-        goal=(len(grid) - 1, len(grid[0]) - 1),
-        min_steps=1,
-        max_steps=3,
-    )
+def solve_1(grid: Grid):
+    return least_heat_loss(grid, min_steps=1, max_steps=3)
+
+
+@attempt.variant(part=1, name="dijkstra")
+def solve_1_dijkstra(grid: Grid):
+    return least_heat_loss(grid, min_steps=1, max_steps=3, search="dijkstra")
+
+
+@attempt.variant(part=1, name="deque")
+def solve_1_deque(grid: Grid):
+    return least_heat_loss(grid, min_steps=1, max_steps=3, search="deque")
 
 
 attempt = aoc(day=17, example=(
@@ -120,12 +187,15 @@ attempt = aoc(day=17, example=(
 
 
 @attempt(part=2, expected=(94, 71))
-def solve_2(input: str):
-    grid = parse(input)
-    return shortest_path(
-        grid=grid,
-        start=(0, 0),
-        goal=(len(grid) - 1, len(grid[0]) - 1),
-        min_steps=4,
-        max_steps=10,
-    )
+def solve_2(grid: Grid):
+    return least_heat_loss(grid, min_steps=4, max_steps=10)
+
+
+@attempt.variant(part=2, name="dijkstra")
+def solve_2_dijkstra(grid: Grid):
+    return least_heat_loss(grid, min_steps=4, max_steps=10, search="dijkstra")
+
+
+@attempt.variant(part=2, name="deque")
+def solve_2_deque(grid: Grid):
+    return least_heat_loss(grid, min_steps=4, max_steps=10, search="deque")
@@ -38,8 +38,8 @@ class D(tuple[Literal[-1, 0, 1], Literal[-1, 0, 1]], Enum):
         return point[0] + self[0] * steps, point[1] + self[1] * steps
 
 
-def parse_1(input: str) -> Iterable[tuple[D, int]]:
-    for line in input.splitlines():
+def parse_1(lines: Iterable[str]) -> Iterable[tuple[D, int]]:
+    for line in lines:
         direction, steps, _ = line.split(" ")
         yield (
             {"D": D.DOWN, "R": D.RIGHT, "U": D.UP, "L": D.LEFT}[direction],
@@ -47,8 +47,8 @@ def parse_1(input: str) -> Iterable[tuple[D, int]]:
         )
 
 
-def parse_2(input: str) -> Iterable[tuple[D, int]]:
-    for line in input.splitlines():
+def parse_2(lines: Iterable[str]) -> Iterable[tuple[D, int]]:
+    for line in lines:
         _, hex_digits = line.split("#")
         yield (
             {"0": D.RIGHT, "1": D.DOWN, "2": D.LEFT, "3": D.UP}[hex_digits[5]],
@@ -70,11 +70,11 @@ def get_hole_size(instructions: Iterable[tuple[D, int]]) -> int:
     return interior + 1
 
 
-@attempt(part=1, expected=62)
-def solve_1(input: str):
-    return get_hole_size(parse_1(input))
+@attempt(part=1, expected=62, stream="lines")
+def solve_1(lines: Iterable[str]):
+    return get_hole_size(parse_1(lines))
 
 
-@attempt(part=2, expected=952_408_144_115)
-def solve_2(input: str):
-    return get_hole_size(parse_2(input))
+@attempt(part=2, expected=952_408_144_115, stream="lines")
+def solve_2(lines: Iterable[str]):
+    return get_hole_size(parse_2(lines))
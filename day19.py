@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass
 from functools import reduce
 from operator import mul
+from types import MappingProxyType
 from typing import Literal, Optional
 
 from aoc import aoc
@@ -32,7 +33,7 @@ hdj{m>838:A,pv}
 )
 
 
-type Part = dict[str, int]
+type Part = Mapping[str, int]
 type PartRange = dict[str, range]
 
 
@@ -78,8 +79,14 @@ def parse_workflows(input: str) -> Iterable[Workflow]:
 
 def parse_parts(input: str) -> Iterable[Part]:
     for part_def in input.splitlines():
-        yield {cat: int(value) for cat, value
-               in (item.split("=") for item in part_def[1:-1].split(","))}
+        yield MappingProxyType({cat: int(value) for cat, value
+                                in (item.split("=") for item in part_def[1:-1].split(","))})
+
+
+@attempt.parser
+def parse(input: str) -> tuple[tuple[Workflow, ...], tuple[Part, ...]]:
+    workflows_defs, part_defs = input.split("\n\n")
+    return tuple(parse_workflows(workflows_defs)), tuple(parse_parts(part_defs))
 
 
 def process_part(workflows: dict[str, Workflow], part: Part) -> bool:
@@ -101,9 +108,8 @@ def get_accepted_parts(workflows: Iterable[Workflow], parts: Iterable[Part]) ->
 
 
 @attempt(part=1, expected=19114)
-def solve_1(input: str):
-    workflows_defs, part_defs = input.split("\n\n")
-    accepted_parts = get_accepted_parts(parse_workflows(workflows_defs), parse_parts(part_defs))
+def solve_1(input: tuple[tuple[Workflow, ...], tuple[Part, ...]]):
+    accepted_parts = get_accepted_parts(*input)
     return sum(sum(part.values()) for part in accepted_parts)
 
 
@@ -141,7 +147,7 @@ def follow_part_ranges(workflows: Iterable[Workflow]) -> Iterable[PartRange]:
 
 
 @attempt(part=2, expected=167_409_079_868_000)
-def solve_2(input: str):
-    workflows = parse_workflows(input.split("\n\n")[0])
+def solve_2(input: tuple[tuple[Workflow, ...], tuple[Part, ...]]):
+    workflows, _ = input
     part_ranges = follow_part_ranges(workflows)
     return sum(reduce(mul, map(len, parts.values())) for parts in part_ranges)
@@ -8,7 +8,7 @@ from itertools import chain
 from operator import mul
 from typing import Literal, Optional
 
-from aoc import aoc
+from aoc import aoc, checkpoint, counter
 
 
 attempt = aoc(day=20, example=(
@@ -97,22 +97,31 @@ def simulate(network: dict[str, Module]):
                 pulses.extend((value, name, output) for output in outputs)
 
 
-@attempt(part=1, expected=(32000000, 11687500))
-def solve_1(input: str):
+@attempt.parser
+def parse_network(input: str) -> dict[str, Module]:
+    """The network's modules are stateful, so each part gets its own copy."""
     network = {module.name: module for module in parse(input)}
     init_conjunctions(network)
+    return network
+
+
+@attempt(part=1, expected=(32000000, 11687500))
+def solve_1(network: dict[str, Module]):
     pulses = Counter(pulse[0] for pulse in chain.from_iterable(simulate(network) for _ in range(1000)))
     return pulses["low"] * pulses["high"]
 
 
 @attempt(part=2, expected=())
-def solve_2(input: str):
+def solve_2(network: dict[str, Module]):
     # Doesn't work
-    network = {module.name: module for module in parse(input)}
-    init_conjunctions(network)
-    for i in range(100_000):
-        if i % 10_000 == 0:
-            print(i)
+    state = checkpoint("presses")
+    network, first = state.load(default=(network, 0))
+    presses = counter("button presses", total=100_000)
+    presses.tick(first)
+    for i in range(first, 100_000):
+        if state.due():
+            state.save((network, i))
+        presses.tick()
         for value, _, to_module in simulate(network):
             if to_module == "rx" and value == "low":
                 return i + 1
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""Synthetic puzzle inputs of configurable size, for benchmarking solvers.
+
+Each generator builds a valid input for its day from a size parameter and a
+random number generator, e.g. `./generators.py 16 1000 > inputs/day16.txt`
+creates a 1000×1000 mirror grid.
+"""
+
+import random
+import string
+import sys
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Generator:
+    day: int
+    build: Callable[[int, random.Random], str]
+    parameter: str
+    sizes: tuple[int, ...]
+    parts: tuple[int, ...] = (1, 2)
+
+GENERATORS: dict[int, Generator] = {}
+
+
+def generator(*, day: int, parameter: str, sizes: tuple[int, ...], parts: tuple[int, ...] = (1, 2)):
+    def register(build: Callable[[int, random.Random], str]):
+        GENERATORS[day] = Generator(day, build, parameter, sizes, parts)
+        return build
+    return register
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    return GENERATORS[day].build(size, random.Random(seed))
+
+
+LINES = (100, 1_000, 10_000, 100_000)
+GRID_SIDES = (10, 20, 40, 80, 160)
+
+
+def unique_names(rng: random.Random, length: int, alphabet: str = string.ascii_lowercase):
+    """Endless stream of distinct random names"""
+    seen = set()
+    while True:
+        name = "".join(rng.choices(alphabet, k=length))
+        if name not in seen:
+            seen.add(name)
+            yield name
+
+
+@generator(day=1, parameter="lines", sizes=LINES, parts=(1,))
+def day01(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        chars = rng.choices(string.ascii_lowercase, k=rng.randint(4, 40))
+        for _ in range(rng.randint(1, 4)):
+            chars.insert(rng.randint(0, len(chars)), rng.choice(string.digits[1:]))
+        lines.append("".join(chars))
+    return "\n".join(lines)
+
+
+@generator(day=2, parameter="lines", sizes=LINES)
+def day02(size: int, rng: random.Random) -> str:
+    lines = []
+    for game in range(1, size + 1):
+        sets = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(("red", "green", "blue"), rng.randint(1, 3))
+            sets.append(", ".join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game}: {'; '.join(sets)}")
+    return "\n".join(lines)
+
+
+@generator(day=3, parameter="grid side", sizes=GRID_SIDES)
+def day03(size: int, rng: random.Random) -> str:
+    rows = []
+    for _ in range(size):
+        row = ""
+        while len(row) < size:
+            match rng.random():
+                case r if r < .15:
+                    row += str(rng.randint(1, 999)) + "."
+                case r if r < .20:
+                    row += rng.choice("*#+$/=%@&-")
+                case _:
+                    row += "."
+        rows.append(row[:size])
+    return "\n".join(rows)
+
+
+@generator(day=4, parameter="lines", sizes=LINES)
+def day04(size: int, rng: random.Random) -> str:
+    lines = []
+    for idx in range(size):
+        numbers = rng.sample(range(1, 100), 35)
+        winning, others = numbers[:10], numbers[10:]
+        # cards never win copies of cards past the end of the table
+        matches = rng.randint(0, min(len(winning), size - idx - 1))
+        own = rng.sample(winning, matches) + others[:25 - matches]
+        rng.shuffle(own)
+        lines.append(f"Card {idx + 1:>{len(str(size))}}: "
+                     f"{' '.join(f'{n:2}' for n in winning)} | {' '.join(f'{n:2}' for n in own)}")
+    return "\n".join(lines)
+
+
+@generator(day=5, parameter="ranges per map", sizes=(10, 30, 100, 300, 1_000))
+def day05(size: int, rng: random.Random) -> str:
+    seeds = []
+    for _ in range(size):
+        seeds += rng.randrange(2**32), rng.randint(1, 2**24)
+    blocks = [f"seeds: {' '.join(map(str, seeds))}"]
+    categories = ("seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location")
+    for source, destination in zip(categories, categories[1:]):
+        lengths = [rng.randint(1, 2**32 // size) for _ in range(size)]
+        source_starts = [sum(lengths[:idx]) for idx in range(size)]
+        order = rng.sample(range(size), size)
+        destination_starts = {idx: sum(lengths[other] for other in order[:position])
+                              for position, idx in enumerate(order)}
+        mapping = [f"{destination_starts[idx]} {source_starts[idx]} {lengths[idx]}"
+                   for idx in range(size) if rng.random() < .9]
+        rng.shuffle(mapping)
+        blocks.append(f"{source}-to-{destination} map:\n" + "\n".join(mapping))
+    return "\n\n".join(blocks)
+
+
+@generator(day=6, parameter="races", sizes=(1, 2, 4, 8))
+def day06(size: int, rng: random.Random) -> str:
+    times = [rng.randint(10, 99) for _ in range(size)]
+    distances = [rng.randint(1, time * time // 4 - 1) for time in times]
+    return (f"Time:     {' '.join(f'{time:4}' for time in times)}\n"
+            f"Distance: {' '.join(f'{distance:4}' for distance in distances)}")
+
+
+@generator(day=7, parameter="lines", sizes=LINES)
+def day07(size: int, rng: random.Random) -> str:
+    return "\n".join(f"{''.join(rng.choices('23456789TJQKA', k=5))} {rng.randint(1, 1000)}"
+                     for _ in range(size))
+
+
+@generator(day=8, parameter="nodes", sizes=(100, 1_000, 10_000, 40_000))
+def day08(size: int, rng: random.Random) -> str:
+    """Six ghost cycles in the shape the puzzle relies on: the distance from
+    each start node to its end node equals the cycle length.
+    """
+    alphabet = string.ascii_uppercase + string.digits
+    names = (name for name in unique_names(rng, 3, alphabet) if name[-1] not in "AZ")
+    prefixes = ["AA"] + [prefix for prefix, _ in zip(unique_names(rng, 2, alphabet), range(6))
+                         if prefix not in ("AA", "ZZ")][:5]
+    lines = []
+    for prefix in prefixes:
+        chain = [next(names) for _ in range(max(1, size // len(prefixes)))]
+        start, end = prefix + "A", "ZZZ" if prefix == "AA" else prefix + "Z"
+        path = [start, *chain, end, chain[0]]
+        for node, next_node in zip(path, path[1:]):
+            lines.append(f"{node} = ({next_node}, {next_node})")
+    rng.shuffle(lines)
+    instructions = "".join(rng.choices("LR", k=rng.randint(100, 300)))
+    return instructions + "\n\n" + "\n".join(lines)
+
+
+@generator(day=9, parameter="lines", sizes=LINES)
+def day09(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randint(-9, 9) for _ in range(rng.randint(1, 6))]
+        values = (sum(c * x ** power for power, c in enumerate(coefficients)) for x in range(21))
+        lines.append(" ".join(map(str, values)))
+    return "\n".join(lines)
+
+
+PIPES = {
+    frozenset(((-1, 0), (1, 0))): "|",
+    frozenset(((0, -1), (0, 1))): "-",
+    frozenset(((-1, 0), (0, 1))): "L",
+    frozenset(((-1, 0), (0, -1))): "J",
+    frozenset(((1, 0), (0, -1))): "7",
+    frozenset(((1, 0), (0, 1))): "F",
+}
+
+@generator(day=10, parameter="grid side", sizes=GRID_SIDES)
+def day10(size: int, rng: random.Random) -> str:
+    """A comb-shaped loop with teeth of random depth hanging from the top edge."""
+    size = max(size, 6)
+    top, bottom, left, right = 1, size - 2, 1, size - 2
+    loop = [(row, left) for row in range(top, bottom + 1)]
+    loop += [(bottom, col) for col in range(left + 1, right + 1)]
+    loop += [(row, right) for row in range(bottom - 1, top - 1, -1)]
+    col = right - 1
+    while col > left:
+        if col - 1 > left and rng.random() < .5:
+            depth = rng.randint(top + 1, bottom - 2)
+            loop += [(row, col) for row in range(top, depth + 1)]
+            loop += [(row, col - 1) for row in range(depth, top - 1, -1)]
+            col -= 2
+        else:
+            loop.append((top, col))
+            col -= 1
+
+    grid = [[rng.choice("|-LJ7F.......") for _ in range(size)] for _ in range(size)]
+    for row, col in ((top - 1, left), (top, left - 1), (top + 1, left + 1)):
+        grid[row][col] = "."  # no stray pipes connecting to the start
+    for idx, (row, col) in enumerate(loop):
+        previous, following = loop[idx - 1], loop[(idx + 1) % len(loop)]
+        grid[row][col] = PIPES[frozenset(((previous[0] - row, previous[1] - col),
+                                          (following[0] - row, following[1] - col)))]
+    grid[top][left] = "S"
+    return "\n".join(map("".join, grid))
+
+
+@generator(day=11, parameter="galaxies", sizes=(10, 100, 1_000, 4_000))
+def day11(size: int, rng: random.Random) -> str:
+    side = max(2, round((size * 10) ** .5))
+    galaxies = set(rng.sample(range(side * side), min(size, side * side)))
+    return "\n".join("".join("#" if row * side + col in galaxies else "." for col in range(side))
+                     for row in range(side))
+
+
+@generator(day=12, parameter="unfold factor", sizes=(1, 2, 4, 8, 16))
+def day12(size: int, rng: random.Random) -> str:
+    """Twenty random records, each unfolded `size` times like in part 2."""
+    lines = []
+    for _ in range(20):
+        runs = [rng.randint(1, 4) for _ in range(rng.randint(2, 5))]
+        record = "." * rng.randint(0, 2) + "".join(
+            "#" * run + "." * rng.randint(1, 3) for run in runs)
+        record = "".join("?" if rng.random() < .4 else char for char in record)
+        lines.append("?".join((record,) * size) + " " + ",".join(map(str, runs * size)))
+    return "\n".join(lines)
+
+
+@generator(day=13, parameter="image side", sizes=(8, 16, 32, 64, 128))
+def day13(size: int, rng: random.Random) -> str:
+    """Images with a perfect vertical mirror axis and a horizontal axis that
+    is off by exactly one smudge, outside of the vertically mirrored area.
+    """
+    size = max(size, 3)
+    half_width = (size - 1) // 2
+    images = []
+    for _ in range(10):
+        rows = []
+        for _ in range(size // 2):
+            half = rng.choices("#.", k=half_width)
+            rows.append(half + half[::-1] + rng.choices("#.", k=size - 2 * half_width))
+        rows += [list(row) for row in reversed(rows)]
+        rows[0][2 * half_width] = "#" if rows[0][2 * half_width] == "." else "."
+        images.append("\n".join(map("".join, rows)))
+    return "\n\n".join(images)
+
+
+@generator(day=14, parameter="grid side", sizes=GRID_SIDES)
+def day14(size: int, rng: random.Random) -> str:
+    return "\n".join("".join(rng.choices("O#.", weights=(2, 1, 7), k=size)) for _ in range(size))
+
+
+@generator(day=15, parameter="steps", sizes=(1_000, 10_000, 100_000, 1_000_000))
+def day15(size: int, rng: random.Random) -> str:
+    labels = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6))) for _ in range(500)]
+    return ",".join(label + "-" if rng.random() < .3 else f"{label}={rng.randint(1, 9)}"
+                    for label in rng.choices(labels, k=size))
+
+
+@generator(day=16, parameter="grid side", sizes=GRID_SIDES)
+def day16(size: int, rng: random.Random) -> str:
+    return "\n".join("".join(rng.choices(".|-/\\", weights=(45, 1, 1, 1, 1), k=size)) for _ in range(size))
+
+
+@generator(day=17, parameter="grid side", sizes=GRID_SIDES)
+def day17(size: int, rng: random.Random) -> str:
+    return "\n".join("".join(rng.choices("123456789", k=size)) for _ in range(size))
+
+
+def skyline(columns: int, max_width: int, max_depth: int, rng: random.Random) -> list[tuple[str, int]]:
+    """Clockwise dig plan of a lagoon whose bottom edge has `columns` steps."""
+    widths = [rng.randint(1, max_width) for _ in range(columns)]
+    depths = [rng.randint(1, max_depth)]
+    while len(depths) < columns:
+        if (depth := rng.randint(1, max_depth)) != depths[-1]:
+            depths.append(depth)
+    plan = [("R", sum(widths)), ("D", depths[-1])]
+    for idx in range(columns - 1, 0, -1):
+        plan.append(("L", widths[idx]))
+        step = depths[idx - 1] - depths[idx]
+        plan.append(("D" if step > 0 else "U", abs(step)))
+    plan += ("L", widths[0]), ("U", depths[0])
+    return plan
+
+
+@generator(day=18, parameter="steps in the lagoon's edge", sizes=(10, 100, 1_000, 10_000))
+def day18(size: int, rng: random.Random) -> str:
+    size = max(size, 2)
+    plan = skyline(size, 9, 20, rng)
+    hex_plan = skyline(size, (2**20 - 1) // size, 2**20 - 1, rng)
+    return "\n".join(f"{direction} {steps} (#{hex_steps:05x}{'RDLU'.index(hex_direction)})"
+                     for (direction, steps), (hex_direction, hex_steps) in zip(plan, hex_plan))
+
+
+@generator(day=19, parameter="workflows and parts", sizes=(10, 100, 1_000, 10_000))
+def day19(size: int, rng: random.Random) -> str:
+    """Workflows form a tree rooted at `in`, like in the real input."""
+    names = ["in"] + [name for name, _ in zip(unique_names(rng, 3), range(size - 1)) if name != "in"]
+    children = iter(names[1:])
+    workflows = []
+    for name in names:
+        targets = [next(children, None) or rng.choice("AR") for _ in range(rng.randint(2, 4))]
+        rules = [f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target}"
+                 for target in targets[:-1]]
+        workflows.append(f"{name}{{{','.join(rules + targets[-1:])}}}")
+    rng.shuffle(workflows)
+    parts = ("{" + ",".join(f"{category}={rng.randint(1, 4000)}" for category in "xmas") + "}"
+             for _ in range(size))
+    return "\n".join(workflows) + "\n\n" + "\n".join(parts)
+
+
+@generator(day=20, parameter="flip-flops per counter", sizes=(4, 8, 12, 16), parts=(1,))
+def day20(size: int, rng: random.Random) -> str:
+    """Four binary counters that each reset through a conjunction, feeding
+    into `rx` like the real puzzle input.
+    """
+    names = (name for name in unique_names(rng, 2) if name not in ("rx", "zz"))
+    lines = []
+    starts = []
+    for _ in range(4):
+        flip_flops = [next(names) for _ in range(size)]
+        conjunction, inverter = next(names), next(names)
+        limit = rng.randrange(2 ** (size - 1), 2 ** size) | 1
+        for bit, flip_flop in enumerate(flip_flops):
+            outputs = flip_flops[bit + 1:bit + 2]
+            if limit >> bit & 1:
+                outputs.append(conjunction)
+            lines.append(f"%{flip_flop} -> {', '.join(outputs)}")
+        resets = [flip_flop for bit, flip_flop in enumerate(flip_flops) if bit == 0 or not limit >> bit & 1]
+        lines.append(f"&{conjunction} -> {', '.join(resets + [inverter])}")
+        lines.append(f"&{inverter} -> zz")
+        starts.append(flip_flops[0])
+    lines.append(f"broadcaster -> {', '.join(starts)}")
+    lines.append("&zz -> rx")
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        sys.exit(f"usage: {sys.argv[0]} DAY SIZE [SEED]")
+    print(generate(*map(int, sys.argv[1:])))
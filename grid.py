@@ -0,0 +1,76 @@
+"""Compact character grids for the grid days.
+
+A grid is stored row by row in one bytes object and surrounded by a one
+cell wide border, so cells are addressed by a single flat index and a step
+in any direction is one addition of that direction's offset. Walking off
+the grid lands on a border cell instead of raising an IndexError or
+wrapping around.
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+type Direction = int
+
+DOWN, RIGHT, UP, LEFT = DIRECTIONS = range(4)
+DELTAS = ((1, 0), (0, 1), (-1, 0), (0, -1))  # (row, column) step of each direction
+
+
+def turn_left(direction: Direction) -> Direction:
+    return (direction + 1) % 4
+
+
+def turn_right(direction: Direction) -> Direction:
+    return (direction + 3) % 4
+
+
+def reverse(direction: Direction) -> Direction:
+    return (direction + 2) % 4
+
+
+def is_vertical(direction: Direction) -> bool:
+    return direction % 2 == 0
+
+
+@dataclass(frozen=True)
+class Grid:
+    cells: bytes
+    width: int
+    height: int
+    border: int
+    stride: int
+    offsets: tuple[int, int, int, int]  # flat index step of each direction
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[bytes], border: bytes = b" ") -> "Grid":
+        rows = list(rows)
+        width, stride = len(rows[0]), len(rows[0]) + 2
+        padding = border * stride
+        cells = b"".join((padding, *(border + row + border for row in rows), padding))
+        return cls(cells, width, len(rows), border[0], stride, (stride, 1, -stride, -1))
+
+    @classmethod
+    def parse(cls, text: str, border: bytes = b" ") -> "Grid":
+        return cls.from_rows((line.encode() for line in text.splitlines()), border)
+
+    def index(self, row: int, column: int) -> int:
+        return (row + 1) * self.stride + column + 1
+
+    def point(self, index: int) -> tuple[int, int]:
+        row, column = divmod(index, self.stride)
+        return row - 1, column - 1
+
+    def indices(self) -> Iterator[int]:
+        """Flat indices of all cells inside the border, row by row."""
+        for row in range(1, self.height + 1):
+            yield from range(row * self.stride + 1, row * self.stride + self.width + 1)
+
+    def find(self, char: str) -> int:
+        return self.cells.index(char.encode())
+
+    def rows(self) -> Iterator[bytes]:
+        for row in range(1, self.height + 1):
+            yield self.cells[row * self.stride + 1:row * self.stride + self.width + 1]
+
+    def __str__(self) -> str:
+        return "\n".join(row.decode() for row in self.rows())